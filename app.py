@@ -7,7 +7,10 @@ from pathlib import Path
 import shutil
 import zipfile
 
-from batch_processor import get_processor, start_background_processing, stop_background_processing
+from batch_processor import (
+    get_processor, start_background_processing, start_background_reparse, stop_background_processing
+)
+from results_store import RECORD_FILTERS
 
 app = Flask(__name__)
 
@@ -145,6 +148,7 @@ HTML_INDEX = """
             <h3>Korábbi eredmény elérhető</h3>
             <a href="/download" class="action-btn download-btn">📥 Excel letöltése</a>
             <a href="/download-errors" class="action-btn" style="background: #ffc107; color: #333;">⚠️ Hiba riport</a>
+            <a href="/reparse" class="action-btn" style="background: #17a2b8; color: white;">🔁 Újrafeldolgozás (OCR nélkül)</a>
             <a href="/clear" class="action-btn clear-btn">🗑️ Törlés</a>
         </div>
         {% endif %}
@@ -198,7 +202,9 @@ HTML_PROGRESS = """
         </div>
         
         <div class="status {{ 'completed' if progress.status == 'completed' else 'running' if progress.status == 'running' else 'error' if 'error' in progress.status else '' }}">
-            {% if progress.status == 'running' %}
+            {% if progress.status == 'running' and progress.job == 'reparse' %}
+                ⏳ Újrafeldolgozás folyamatban (mentett szövegekből)...
+            {% elif progress.status == 'running' %}
                 ⏳ Feldolgozás folyamatban...
             {% elif progress.status == 'completed' %}
                 ✅ Feldolgozás kész!
@@ -217,9 +223,11 @@ HTML_PROGRESS = """
             {% if progress.status == 'completed' or progress.status == 'stopped' %}
                 <a href="/download" class="action-btn download-btn">📥 Excel letöltése</a>
                 <a href="/download-errors" class="action-btn error-btn">⚠️ Hiba riport ({{ error_count }})</a>
+                <a href="/reparse" class="action-btn" style="background: #17a2b8; color: white;">🔁 Újrafeldolgozás</a>
             {% endif %}
             
             {% if progress.status == 'running' %}
+                <a href="/download-snapshot" class="action-btn download-btn">📸 Részleges Excel</a>
                 <a href="/stop" class="action-btn stop-btn">⏹️ Leállítás</a>
             {% endif %}
             
@@ -241,6 +249,12 @@ def count_pdfs():
     if not UPLOAD_DIR.exists(): return 0
     return len(list(UPLOAD_DIR.rglob("*.pdf")))
 
+def results_exist():
+    """An exported Excel or stored results of an earlier job."""
+    if (OUTPUT_DIR / "cadastral_data.xlsx").exists():
+        return True
+    return get_processor(UPLOAD_DIR, OUTPUT_DIR).store.has_records()
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     global _last_folder
@@ -267,7 +281,7 @@ def index():
     processor = get_processor(UPLOAD_DIR, OUTPUT_DIR)
     is_processing = processor.is_running
     
-    excel_exists = (OUTPUT_DIR / "cadastral_data.xlsx").exists()
+    excel_exists = results_exist()
     
     return render_template_string(
         HTML_INDEX, 
@@ -292,7 +306,7 @@ def process_folder():
             pdf_count=count_pdfs(),
             error="Kérlek add meg a mappa útvonalát!",
             is_processing=False,
-            excel_exists=(OUTPUT_DIR / "cadastral_data.xlsx").exists(),
+            excel_exists=results_exist(),
             last_folder=_last_folder
         )
     
@@ -304,7 +318,7 @@ def process_folder():
             pdf_count=count_pdfs(),
             error=f"A mappa nem létezik: {folder_path}",
             is_processing=False,
-            excel_exists=(OUTPUT_DIR / "cadastral_data.xlsx").exists(),
+            excel_exists=results_exist(),
             last_folder=_last_folder
         )
     
@@ -314,7 +328,7 @@ def process_folder():
             pdf_count=count_pdfs(),
             error=f"Ez nem egy mappa: {folder_path}",
             is_processing=False,
-            excel_exists=(OUTPUT_DIR / "cadastral_data.xlsx").exists(),
+            excel_exists=results_exist(),
             last_folder=_last_folder
         )
     
@@ -326,7 +340,7 @@ def process_folder():
             pdf_count=count_pdfs(),
             error=f"Nincs PDF fájl a mappában: {folder_path}",
             is_processing=False,
-            excel_exists=(OUTPUT_DIR / "cadastral_data.xlsx").exists(),
+            excel_exists=results_exist(),
             last_folder=_last_folder
         )
     
@@ -349,7 +363,7 @@ def upload_zip():
             pdf_count=count_pdfs(),
             error="Kérlek válassz ki egy ZIP fájlt!",
             is_processing=False,
-            excel_exists=(OUTPUT_DIR / "cadastral_data.xlsx").exists(),
+            excel_exists=results_exist(),
             last_folder=_last_folder
         )
     
@@ -359,7 +373,7 @@ def upload_zip():
             pdf_count=count_pdfs(),
             error="Csak ZIP fájl tölthető fel!",
             is_processing=False,
-            excel_exists=(OUTPUT_DIR / "cadastral_data.xlsx").exists(),
+            excel_exists=results_exist(),
             last_folder=_last_folder
         )
     
@@ -402,7 +416,7 @@ def upload_zip():
                 pdf_count=count_pdfs(),
                 error="A ZIP fájl nem tartalmaz PDF fájlokat!",
                 is_processing=False,
-                excel_exists=(OUTPUT_DIR / "cadastral_data.xlsx").exists(),
+                excel_exists=results_exist(),
                 last_folder=_last_folder
             )
         
@@ -418,7 +432,7 @@ def upload_zip():
             pdf_count=count_pdfs(),
             error="Hibás ZIP fájl! Kérlek próbáld újra.",
             is_processing=False,
-            excel_exists=(OUTPUT_DIR / "cadastral_data.xlsx").exists(),
+            excel_exists=results_exist(),
             last_folder=_last_folder
         )
     except Exception as e:
@@ -427,7 +441,7 @@ def upload_zip():
             pdf_count=count_pdfs(),
             error=f"Hiba történt: {str(e)[:100]}",
             is_processing=False,
-            excel_exists=(OUTPUT_DIR / "cadastral_data.xlsx").exists(),
+            excel_exists=results_exist(),
             last_folder=_last_folder
         )
 
@@ -455,6 +469,12 @@ def start():
     success, msg = start_background_processing(UPLOAD_DIR, OUTPUT_DIR, resume=True)
     return redirect(url_for("progress"))
 
+@app.route("/reparse")
+def reparse():
+    """Re-run parsing and validation on the stored texts (no extraction/OCR) and rebuild the Excel."""
+    success, msg = start_background_reparse(UPLOAD_DIR, OUTPUT_DIR)
+    return redirect(url_for("progress"))
+
 @app.route("/stop")
 def stop():
     """Stop processing."""
@@ -463,11 +483,24 @@ def stop():
 
 @app.route("/download")
 def download():
-    excel_path = OUTPUT_DIR / "cadastral_data.xlsx"
+    processor = get_processor(UPLOAD_DIR, OUTPUT_DIR)
+    excel_path = processor.excel_path
+    # The Excel is an export of the results store: rebuild it if a job ended without writing it
+    if not excel_path.exists() and not processor.is_running:
+        processor.save_excel()
     if excel_path.exists():
-        return send_file(excel_path, as_attachment=True, download_name="Registru_Cadastral_Final.xlsx")
+        return send_file(excel_path.resolve(), as_attachment=True, download_name="Registru_Cadastral_Final.xlsx")
     return redirect(url_for("index"))
 
+@app.route("/download-snapshot")
+def download_snapshot():
+    """Excel of the PDFs finished so far, built on demand while a job is running."""
+    processor = get_processor(UPLOAD_DIR, OUTPUT_DIR)
+    snapshot_path = processor.save_snapshot()
+    if snapshot_path:
+        return send_file(snapshot_path.resolve(), as_attachment=True, download_name="Registru_Cadastral_Partial.xlsx")
+    return redirect(url_for("progress"))
+
 @app.route("/download-errors")
 def download_errors():
     """Download error report as CSV."""
@@ -486,6 +519,51 @@ def errors():
     processor = get_processor(UPLOAD_DIR, OUTPUT_DIR)
     return jsonify(processor.load_errors())
 
+API_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 500
+
+def json_conditional(payload):
+    """JSON response with an ETag of its body; answers 304 when the client's copy is current."""
+    response = jsonify(payload)
+    response.add_etag()
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+@app.route("/api/records")
+def api_records():
+    """
+    One page of results from the results store.
+    Filters: uat, localitate, status (exact), owner (substring of Proprietari).
+    Paging: limit (max API_MAX_PAGE_SIZE) and after = the "next" cursor of the previous page.
+    """
+    processor = get_processor(UPLOAD_DIR, OUTPUT_DIR)
+    try:
+        limit = int(request.args.get("limit", API_PAGE_SIZE))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= API_MAX_PAGE_SIZE:
+        return jsonify({"error": f"A 'limit' 1 és {API_MAX_PAGE_SIZE} közötti egész szám lehet"}), 400
+    try:
+        after = int(request.args.get("after", 0))
+    except ValueError:
+        after = -1
+    if after < 0:
+        return jsonify({"error": "Az 'after' nemnegatív egész szám lehet (az előző oldal 'next' értéke)"}), 400
+
+    filters = {name: request.args[name] for name in RECORD_FILTERS if request.args.get(name)}
+    owner = request.args.get("owner", "").strip()
+    records, next_cursor = processor.store.query_records(filters, owner, after, limit)
+    return json_conditional({"records": records, "next": next_cursor, "limit": limit})
+
+@app.route("/api/records/<cf>")
+def api_records_by_cf(cf):
+    """Every record of one CF number."""
+    processor = get_processor(UPLOAD_DIR, OUTPUT_DIR)
+    records = processor.store.records_by_cf(cf)
+    if not records:
+        return jsonify({"error": f"Nincs találat: CF {cf}"}), 404
+    return json_conditional({"cf": cf, "records": records})
+
 @app.route("/clear")
 def clear():
     # Stop any running process
@@ -1,89 +1,225 @@
 """
-Robust Batch PDF Processor with checkpoint support.
+Robust Batch PDF Processor with a per-file SQLite results store.
 Handles 5000+ PDFs reliably with progress tracking and error reporting.
+Jobs run as a streaming pipeline (see pipeline.py): nothing is held per job
+beyond the names of the stored files.
 """
 import json
+import os
+import shutil
 import threading
 import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
-import pandas as pd
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple, Optional
 
-from text_extractor import extract_text
+from text_extractor import OcrDeferred, extract_text, get_extraction_cache, select_text_backend
 from parser import parse_record
+from parse_budget import ParseTimeout, parse_deadline
+from excel_writer import write_excel
+from records import BuildingRecord
+from results_store import ResultStore
 from validator import validate_row
-from config import COLUMNS, TEMP_DIR
+from triage import triage_pdf, ROUTE_SCANNED, ROUTE_ERRORS
+from scheduler import FAST_LANE, OCR_LANE, run_lanes
+from pipeline import Pipe, start_stage
+from worker_pool import SupervisedPool, TaskTimeout
+from config import (
+    PROCESSING_ENGINE, WORKER_COUNT, CHUNK_SIZE,
+    FAST_LANE_WORKERS, OCR_LANE_WORKERS, DOC_TIMEOUT_SECONDS, TIMEOUT_RETRY,
+    WORKER_MAX_TASKS, WORKER_MAX_RSS_MB,
+    TEXT_BACKEND, TEXT_BACKEND_SAMPLE_SIZE, PARSE_TIMEOUT_SECONDS
+)
 
 # Constants
-BATCH_SIZE = 100  # Process 100 PDFs at a time
-CHECKPOINT_FILE = "checkpoint.json"
-ERRORS_FILE = "errors.json"
+BATCH_SIZE = 100  # Stats, cache eviction and progress every 100 finished PDFs
+PROGRESS_INTERVAL = 2.0  # ...or every 2 seconds, whichever comes first
+RESULTS_FILE = "results.db"  # Per-file results and errors: resume point, downloads, web UI
+SNAPSHOT_FILE = "cadastral_data_partial.xlsx"  # On-demand Excel of a running job
 PROGRESS_FILE = "progress.json"
+STATS_FILE = "extraction_stats.jsonl"
+TEXTS_DIR = "extracted_text"  # One JSON per document: extracted text kept for re-parsing
+
+
+def save_extracted_text(text_dir: Path, filename: str, text: str, used_ocr: bool):
+    """Store a document's extracted text with the output so a reparse job can skip extraction/OCR."""
+    with open(text_dir / f"{filename}.json", 'w', encoding='utf-8') as f:
+        json.dump({"file": filename, "used_ocr": used_ocr, "text": text}, f, ensure_ascii=False)
+
+
+def parse_text(filename: str, text: str) -> Tuple[List[BuildingRecord], Optional[Dict]]:
+    """
+    Parse and validate extracted text (shared by processing and reparse jobs).
+    Returns: (records, error_info)
+    """
+    if not text or len(text.strip()) < 50:
+        return [], {"file": filename, "type": "OCR_FAILED", "details": "Nem olvasható szöveg"}
+    
+    # Parse record within the per-document budget
+    try:
+        with parse_deadline(PARSE_TIMEOUT_SECONDS):
+            parsed = parse_record(filename, text)
+    except ParseTimeout:
+        return [], {"file": filename, "type": "PARSE_TIMEOUT",
+                    "details": f"Feldolgozási időkorlát túllépve ({PARSE_TIMEOUT_SECONDS:g} mp)"}
+    
+    if not parsed:
+        return [], {"file": filename, "type": "PARSE_ERROR", "details": "Nem sikerült kinyerni adatokat"}
+    
+    # Validate and add records
+    records = []
+    for record in parsed:
+        status, msg = validate_row(record)
+        record.Status_Validare = status
+        record.Mesaj_Eroare = msg
+        records.append(record)
+    
+    # Check if owner was found
+    if records and records[0].get('Proprietari') == 'Nedetectat':
+        return records, {"file": filename, "type": "NO_OWNER", "details": "Proprietar nem található"}
+    return records, None
+
+
+def reparse_document(text_path: Path) -> Tuple[List[BuildingRecord], Optional[Dict]]:
+    """
+    Re-run parse and validation on one stored text.
+    Module-level so it can run inside worker processes.
+    Returns: (records, error_info)
+    """
+    filename = text_path.stem  # "<name>.pdf"
+    try:
+        with open(text_path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        return parse_text(entry.get("file", filename), entry["text"])
+    except Exception as e:
+        return [], {"file": filename, "type": "EXCEPTION", "details": str(e)[:200]}
+
+
+def process_pdf(pdf_path: Path, text_backend: Optional[str] = None,
+                text_dir: Optional[Path] = None, allow_ocr: bool = True) -> Tuple[List[Dict], Optional[Dict], Dict]:
+    """
+    Extract, parse and validate one PDF.
+    Module-level so it can run inside worker processes.
+    If text_dir is given, the extracted text is stored there for later reparse jobs.
+    With allow_ocr=False (fast lane) a document that needs OCR is not processed:
+    it comes back without records or error and with stats["deferred"] set.
+    Returns: (records, error_info, stats)
+    """
+    records = []
+    error_info = None
+    stats = {"file": pdf_path.name}
+    
+    try:
+        # Skip macOS resource fork files
+        if pdf_path.name.startswith('._'):
+            return [], None, stats  # Silently skip, don't count as error
+        
+        # Check file size
+        if pdf_path.stat().st_size == 0:
+            return [], {"file": pdf_path.name, "type": "EMPTY_PDF", "details": "0 byte fájl"}, stats
+        
+        # Triage: reject junk before any extraction, send scans straight to OCR
+        triage = triage_pdf(pdf_path)
+        stats["route"] = triage.route
+        stats["page_count"] = triage.page_count
+        if triage.route in ROUTE_ERRORS:
+            error_type, message = ROUTE_ERRORS[triage.route]
+            details = f"{message}: {triage.details}" if triage.details else message
+            return [], {"file": pdf_path.name, "type": error_type, "details": details}, stats
+        
+        # Extract text
+        try:
+            text, used_ocr = extract_text(pdf_path, stats, text_backend,
+                                          scanned=triage.route == ROUTE_SCANNED, allow_ocr=allow_ocr)
+        except OcrDeferred:
+            stats["deferred"] = True
+            return [], None, stats
+        stats["used_ocr"] = used_ocr
+        
+        if text_dir is not None and text:
+            save_extracted_text(text_dir, pdf_path.name, text, used_ocr)
+        
+        records, error_info = parse_text(pdf_path.name, text)
+        
+    except Exception as e:
+        error_info = {"file": pdf_path.name, "type": "EXCEPTION", "details": str(e)[:200]}
+    
+    return records, error_info, stats
+
+
+def failed_result(pdf_path: Path, lane: str, error: Exception) -> Tuple[List[Dict], Dict, Dict]:
+    """Result of a PDF whose worker was killed (timeout) or died."""
+    if isinstance(error, TaskTimeout):
+        error_info = {"file": pdf_path.name, "type": "TIMEOUT",
+                      "details": f"Időkorlát túllépve ({DOC_TIMEOUT_SECONDS:g} mp), a feldolgozás leállítva"}
+    else:
+        error_info = {"file": pdf_path.name, "type": "EXCEPTION",
+                      "details": f"{type(error).__name__}: {error}"[:200]}
+    return [], error_info, {"file": pdf_path.name, "failed": error_info["type"]}
 
 
 class BatchProcessor:
     """
-    Processes PDFs in batches with checkpoint support.
-    Can resume from where it left off if interrupted.
+    Processes PDFs in two lanes (see scheduler.py); every finished PDF goes into
+    the results store as soon as it completes.
+    Can resume from the last stored file if interrupted.
     """
     
     def __init__(self, input_dir: Path, output_dir: Path):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.temp_dir = Path(TEMP_DIR)
-        self.temp_dir.mkdir(parents=True, exist_ok=True)
         
-        self.checkpoint_path = self.output_dir / CHECKPOINT_FILE
-        self.errors_path = self.output_dir / ERRORS_FILE
+        self.store = ResultStore(self.output_dir / RESULTS_FILE)
         self.progress_path = self.output_dir / PROGRESS_FILE
+        self.stats_path = self.output_dir / STATS_FILE
+        self.texts_dir = self.output_dir / TEXTS_DIR
+        self.texts_dir.mkdir(parents=True, exist_ok=True)
         self.excel_path = self.output_dir / "cadastral_data.xlsx"
+        self.snapshot_path = self.output_dir / SNAPSHOT_FILE
         
         self.is_running = False
         self.should_stop = False
+        self._pools: Dict[str, Executor] = {}
+        self.ocr_peak_mb = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.pages_skipped = 0
+        self.text_backend: Optional[str] = None
+        self.job = "extract"  # "extract" = full pipeline, "reparse" = stored texts only
         
-    def get_all_pdfs(self) -> List[Path]:
-        """Get all PDF files from input directory (skip macOS resource forks)."""
-        return sorted([
-            p for p in self.input_dir.glob("*.pdf")
-            if not p.name.startswith('._')
-        ])
-    
-    def load_checkpoint(self) -> Dict:
-        """Load checkpoint from file."""
-        if self.checkpoint_path.exists():
-            try:
-                with open(self.checkpoint_path, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-        return {"processed_files": [], "last_batch": 0}
+    def iter_pdfs(self) -> Iterator[Path]:
+        """PDF files of the input directory in directory order, streamed (skip hidden files and macOS resource forks)."""
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".pdf") and not entry.name.startswith('.') and entry.is_file():
+                    yield Path(entry.path)
     
-    def save_checkpoint(self, processed_files: List[str], batch_num: int):
-        """Save checkpoint to file."""
-        checkpoint = {
-            "processed_files": processed_files,
-            "last_batch": batch_num,
-            "timestamp": datetime.now().isoformat()
-        }
-        with open(self.checkpoint_path, 'w') as f:
-            json.dump(checkpoint, f, indent=2)
+    def get_all_pdfs(self) -> List[Path]:
+        """Get all PDF files from input directory, sorted."""
+        return sorted(self.iter_pdfs())
     
     def load_errors(self) -> List[Dict]:
-        """Load errors from file."""
-        if self.errors_path.exists():
-            try:
-                with open(self.errors_path, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-        return []
+        """Errors recorded in the results store."""
+        return self.store.errors()
     
-    def save_errors(self, errors: List[Dict]):
-        """Save errors to file."""
-        with open(self.errors_path, 'w') as f:
-            json.dump(errors, f, indent=2, ensure_ascii=False)
+    def save_stats(self, stats: List[Dict]):
+        """Append per-document extraction metrics (one JSON object per line)."""
+        with open(self.stats_path, 'a') as f:
+            for entry in stats:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        
+        for entry in stats:
+            self.ocr_peak_mb = max(self.ocr_peak_mb, entry.get("ocr_peak_mb", 0.0))
+            self.pages_skipped += entry.get("pages_skipped", 0)
+            if "cache_hit" in entry:
+                if entry["cache_hit"]:
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
     
     def update_progress(self, current: int, total: int, status: str = "running"):
         """Update progress file."""
@@ -92,6 +228,12 @@ class BatchProcessor:
             "total": total,
             "percent": round((current / total) * 100, 1) if total > 0 else 0,
             "status": status,
+            "ocr_peak_mb": self.ocr_peak_mb,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "pages_skipped": self.pages_skipped,
+            "text_backend": self.text_backend,
+            "job": self.job,
             "timestamp": datetime.now().isoformat()
         }
         with open(self.progress_path, 'w') as f:
@@ -107,152 +249,229 @@ class BatchProcessor:
                 pass
         return {"current": 0, "total": 0, "percent": 0, "status": "idle"}
     
-    def process_single_pdf(self, pdf_path: Path) -> Tuple[List[Dict], Optional[Dict]]:
+    def resolve_text_backend(self, total: int) -> str:
         """
-        Process a single PDF file.
-        Returns: (records, error_info)
+        Text backend of the job: the one stored when the job started, else the configured
+        one or the self-benchmark winner on a sample spread over the input directory.
+        Chosen once per job, so a resume neither repeats the benchmark nor switches backend.
         """
-        records = []
-        error_info = None
-        
-        try:
-            # Skip macOS resource fork files
-            if pdf_path.name.startswith('._'):
-                return [], None  # Silently skip, don't count as error
-            
-            # Check file size
-            if pdf_path.stat().st_size == 0:
-                return [], {"file": pdf_path.name, "type": "EMPTY_PDF", "details": "0 byte fájl"}
-            
-            # Extract text
-            text, used_ocr = extract_text(pdf_path, self.temp_dir)
-            
-            if not text or len(text.strip()) < 50:
-                return [], {"file": pdf_path.name, "type": "OCR_FAILED", "details": "Nem olvasható szöveg"}
-            
-            # Parse record
-            parsed = parse_record(pdf_path.name, text)
-            
-            if not parsed:
-                return [], {"file": pdf_path.name, "type": "PARSE_ERROR", "details": "Nem sikerült kinyerni adatokat"}
-            
-            # Validate and add records
-            for record in parsed:
-                status, msg = validate_row(record)
-                record['Status_Validare'] = status
-                record['Mesaj_Eroare'] = msg
-                records.append(record)
-            
-            # Check if owner was found
-            if records and records[0].get('Proprietari') == 'Nedetectat':
-                error_info = {"file": pdf_path.name, "type": "NO_OWNER", "details": "Proprietar nem található"}
-            
-        except Exception as e:
-            error_info = {"file": pdf_path.name, "type": "EXCEPTION", "details": str(e)[:200]}
-        
-        return records, error_info
+        backend = self.store.setting("text_backend")
+        if backend is None:
+            backend = TEXT_BACKEND
+            if backend == "auto":
+                step = max(1, total // TEXT_BACKEND_SAMPLE_SIZE)
+                backend = select_text_backend(
+                    list(islice(islice(self.iter_pdfs(), 0, None, step), TEXT_BACKEND_SAMPLE_SIZE)))
+            self.store.set_setting("text_backend", backend)
+        return backend
+    
+    def lane_task(self, allow_ocr: bool) -> Callable[[Path], Tuple[List[Dict], Optional[Dict], Dict]]:
+        """process_pdf bound to this job's settings (picklable, for the worker pools)."""
+        return partial(process_pdf, text_backend=self.text_backend,
+                       text_dir=self.texts_dir, allow_ocr=allow_ocr)
+    
+    def _get_pool(self, name: str, workers: int) -> Optional[ProcessPoolExecutor]:
+        """Lazily start a named worker pool (None when running sequentially)."""
+        if PROCESSING_ENGINE != "process" or WORKER_COUNT <= 1:
+            return None
+        if name not in self._pools:
+            self._pools[name] = ProcessPoolExecutor(max_workers=max(1, workers))
+        return self._pools[name]
+    
+    def _get_lane_pool(self, lane: str, workers: int) -> Optional[SupervisedPool]:
+        """
+        Lazily start the supervised pool of a lane (None with the sequential engine).
+        Used even with a single worker: only a separate process can be killed on timeout.
+        """
+        if PROCESSING_ENGINE != "process":
+            return None
+        if lane not in self._pools:
+            self._pools[lane] = SupervisedPool(workers, task_timeout=DOC_TIMEOUT_SECONDS,
+                                               max_tasks=WORKER_MAX_TASKS, max_rss_mb=WORKER_MAX_RSS_MB)
+        return self._pools[lane]
     
-    def process_batch(self, pdf_paths: List[Path]) -> Tuple[List[Dict], List[Dict]]:
+    def _shutdown_pool(self):
+        """Stop the worker pools, dropping PDFs that were not started yet."""
+        for pool in self._pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+        self._pools = {}
+    
+    def _process_lanes(self, pdf_paths: Iterable[Path], processed_set: Set[str], total: int) -> List[Path]:
         """
-        Process a batch of PDFs.
-        Returns: (all_records, errors)
+        Stream PDFs through the pipeline: discover -> fast/OCR lanes -> this thread,
+        the sink, which stores each result as it completes.
+        Returns the PDFs that timed out.
         """
-        all_records = []
-        errors = []
+        # The pipeline's own stop flag: set when this method returns or raises (e.g. the sink
+        # failing), so the discover and lanes threads never outlive the job
+        halted = threading.Event()
+        should_stop = lambda: self.should_stop or halted.is_set()
+        # Pools are started here, so the job thread alone starts and stops them
+        fast_pool = self._get_lane_pool(FAST_LANE, FAST_LANE_WORKERS)
+        ocr_pool = self._get_lane_pool(OCR_LANE, OCR_LANE_WORKERS)
         
-        for pdf_path in pdf_paths:
-            if self.should_stop:
-                break
-                
-            records, error = self.process_single_pdf(pdf_path)
-            all_records.extend(records)
-            
-            if error:
-                errors.append(error)
+        paths = Pipe(should_stop)
+        results = Pipe(should_stop)
+        start_stage("discover", pdf_paths, paths)
+        start_stage("lanes", run_lanes(paths, self.lane_task(allow_ocr=False), self.lane_task(allow_ocr=True),
+                                       fast_pool, ocr_pool, FAST_LANE_WORKERS, OCR_LANE_WORKERS,
+                                       should_stop, failed_result), results)
         
-        return all_records, errors
+        try:
+            timed_out = []
+            pending_stats = []
+            since_eviction = 0
+            last_flush = time.monotonic()
+            for pdf_path, lane, (records, error, stats) in results:
+                if self.should_stop:
+                    break
+                
+                self.store.add(pdf_path.name, records, error)
+                processed_set.add(pdf_path.name)
+                if error and error["type"] == "TIMEOUT":
+                    timed_out.append(pdf_path)
+                stats["lane"] = lane
+                pending_stats.append(stats)
+                since_eviction += 1
+                
+                # Keep the extraction cache within its size budget
+                if since_eviction >= BATCH_SIZE:
+                    cache = get_extraction_cache()
+                    if cache is not None:
+                        cache.evict()
+                    since_eviction = 0
+                
+                if len(pending_stats) >= BATCH_SIZE or time.monotonic() - last_flush >= PROGRESS_INTERVAL:
+                    self._flush(pending_stats, len(processed_set), total)
+                    last_flush = time.monotonic()
+            self._flush(pending_stats, len(processed_set), total)
+            return timed_out
+        finally:
+            halted.set()
+    
+    def _flush(self, stats: List[Dict], done: int, total: int):
+        """Commit the stored results, record stats and publish progress."""
+        self.store.commit()
+        self.save_stats(stats)
+        stats.clear()
+        self.update_progress(done, total, "running")
+    
+    def save_excel(self) -> int:
+        """Export the sorted Excel from the results store (streamed, once per job)."""
+        return write_excel(self.store, self.excel_path)
     
-    def save_excel(self, all_data: List[Dict]):
-        """Save all data to Excel file."""
-        if all_data:
-            df = pd.DataFrame(all_data, columns=COLUMNS)
-            df = df.sort_values(by=['Status_Validare', 'Numar_CF'], ascending=[False, True])
-            df.to_excel(self.excel_path, index=False)
+    def save_snapshot(self) -> Optional[Path]:
+        """Partial Excel of the rows stored so far (None if there are none yet)."""
+        return self.snapshot_path if write_excel(self.store, self.snapshot_path) else None
     
     def run(self, resume: bool = True):
         """
         Run the batch processor.
-        Set resume=True to continue from checkpoint.
+        Set resume=True to skip the files already in the results store.
         """
         self.is_running = True
         self.should_stop = False
+        self.job = "extract"
         
         try:
-            all_pdfs = self.get_all_pdfs()
-            total_pdfs = len(all_pdfs)
+            # Only counted here; the pipeline streams the directory again
+            total_pdfs = sum(1 for _ in self.iter_pdfs())
             
             if total_pdfs == 0:
                 self.update_progress(0, 0, "no_files")
                 return
             
-            # Load checkpoint if resuming
-            checkpoint = self.load_checkpoint() if resume else {"processed_files": [], "last_batch": 0}
-            processed_set = set(checkpoint.get("processed_files", []))
+            # Resume from the results store (WAL folded back first), or start a fresh one
+            if resume:
+                self.store.checkpoint()
+                processed_set = self.store.processed_files()
+            else:
+                self.store.reset()
+                processed_set = set()
             
-            # Load existing errors
-            all_errors = self.load_errors() if resume else []
+            self.update_progress(len(processed_set), total_pdfs, "running")
             
-            # Load existing data if resuming
-            all_data = []
-            if resume and self.excel_path.exists():
-                try:
-                    existing_df = pd.read_excel(self.excel_path)
-                    all_data = existing_df.to_dict('records')
-                except:
-                    pass
+            self.text_backend = self.resolve_text_backend(total_pdfs)
             
-            # Filter out already processed PDFs
-            remaining_pdfs = [p for p in all_pdfs if p.name not in processed_set]
+            # Already processed PDFs are filtered out as they are discovered
+            stored = frozenset(processed_set)
+            remaining_pdfs = (p for p in self.iter_pdfs() if p.name not in stored)
             
-            self.update_progress(len(processed_set), total_pdfs, "running")
+            # Fast lane (text layer) and OCR lane; results are stored in completion order
+            timed_out = self._process_lanes(remaining_pdfs, processed_set, total_pdfs)
+            
+            # One more attempt for timed-out files (a success replaces the TIMEOUT error)
+            if timed_out and TIMEOUT_RETRY and not self.should_stop:
+                self._process_lanes(timed_out, processed_set, total_pdfs)
+            
+            # The Excel is written once, when the job finishes or is stopped
+            self.save_excel()
             
-            # Process in batches
-            batch_num = checkpoint.get("last_batch", 0)
+            # Final status
+            status = "completed" if not self.should_stop else "stopped"
+            self.update_progress(len(processed_set), total_pdfs, status)
             
-            for i in range(0, len(remaining_pdfs), BATCH_SIZE):
+        except Exception as e:
+            self.update_progress(0, 0, f"error: {str(e)[:100]}")
+        
+        finally:
+            self._shutdown_pool()
+            self.store.close()
+            self.is_running = False
+    
+    def reparse(self):
+        """
+        Re-run parse_record + validate_row over the stored texts and rebuild the Excel.
+        No extraction or OCR; results of files without stored text (empty, corrupt, unreadable) are kept.
+        """
+        self.is_running = True
+        self.should_stop = False
+        self.job = "reparse"
+        
+        try:
+            text_paths = sorted(self.texts_dir.glob("*.json"))
+            total = len(text_paths)
+            
+            if total == 0:
+                self.update_progress(0, 0, "no_files")
+                return
+            
+            self.update_progress(0, total, "running")
+            
+            pool = self._get_pool("reparse", WORKER_COUNT)
+            for i in range(0, total, BATCH_SIZE):
                 if self.should_stop:
                     break
                 
-                batch = remaining_pdfs[i:i + BATCH_SIZE]
-                batch_num += 1
-                
-                # Process batch
-                batch_records, batch_errors = self.process_batch(batch)
+                batch = text_paths[i:i + BATCH_SIZE]
+                if pool is not None:
+                    results = pool.map(reparse_document, batch, chunksize=CHUNK_SIZE)
+                else:
+                    results = map(reparse_document, batch)
                 
-                # Add to totals
-                all_data.extend(batch_records)
-                all_errors.extend(batch_errors)
+                # One transaction for the whole reparse, committed only if it completes
+                for text_path, (records, error) in zip(batch, results):
+                    self.store.add(text_path.stem, records, error, autocommit=False)
                 
-                # Mark as processed
-                for pdf in batch:
-                    processed_set.add(pdf.name)
-                
-                # Save checkpoint and Excel after each batch
-                self.save_checkpoint(list(processed_set), batch_num)
-                self.save_excel(all_data)
-                self.save_errors(all_errors)
-                
-                # Update progress
-                self.update_progress(len(processed_set), total_pdfs, "running")
+                self.update_progress(i + len(batch), total, "running")
             
-            # Final status
-            status = "completed" if not self.should_stop else "stopped"
-            self.update_progress(len(processed_set), total_pdfs, status)
+            # A stopped reparse leaves the previous results and Excel untouched
+            if self.should_stop:
+                self.store.rollback()
+                self.update_progress(0, total, "stopped")
+                return
+            
+            self.store.commit()
+            self.save_excel()
+            self.update_progress(total, total, "completed")
             
         except Exception as e:
+            self.store.rollback()
             self.update_progress(0, 0, f"error: {str(e)[:100]}")
         
         finally:
+            self._shutdown_pool()
+            self.store.close()
             self.is_running = False
     
     def stop(self):
@@ -260,13 +479,15 @@ class BatchProcessor:
         self.should_stop = True
     
     def reset(self):
-        """Reset checkpoint and errors to start fresh."""
-        if self.checkpoint_path.exists():
-            self.checkpoint_path.unlink()
-        if self.errors_path.exists():
-            self.errors_path.unlink()
+        """Reset results store, progress and stored texts to start fresh."""
+        self.store.reset()
         if self.progress_path.exists():
             self.progress_path.unlink()
+        if self.stats_path.exists():
+            self.stats_path.unlink()
+        if self.texts_dir.exists():
+            shutil.rmtree(self.texts_dir)
+        self.texts_dir.mkdir(parents=True, exist_ok=True)
     
     def get_error_report_csv(self) -> str:
         """Generate error report as CSV string."""
@@ -315,11 +536,28 @@ def start_background_processing(input_dir: Path, output_dir: Path, resume: bool
     _processor_thread = threading.Thread(target=_processor.run, args=(resume,), daemon=True)
     _processor_thread.start()
     
-    # Count PDFs for message
-    pdf_count = len(_processor.get_all_pdfs())
+    # Count PDFs for message (streamed, like the job's own count: no list of paths)
+    pdf_count = sum(1 for _ in _processor.iter_pdfs())
     return True, f"Feldolgozás elindítva ({pdf_count} PDF)"
 
 
+def start_background_reparse(input_dir: Path, output_dir: Path):
+    """Start a reparse job (stored texts only, no extraction) in a background thread."""
+    global _processor, _processor_thread
+    
+    if _processor is not None and _processor.is_running:
+        return False, "Feldolgozás már folyamatban"
+    
+    _processor = BatchProcessor(Path(input_dir), Path(output_dir))
+    text_count = len(list(_processor.texts_dir.glob("*.json")))
+    if text_count == 0:
+        return False, "Nincs mentett szöveg az újrafeldolgozáshoz"
+    
+    _processor_thread = threading.Thread(target=_processor.reparse, daemon=True)
+    _processor_thread.start()
+    return True, f"Újrafeldolgozás elindítva ({text_count} dokumentum)"
+
+
 def stop_background_processing():
     """Stop background processing."""
     global _processor
@@ -0,0 +1,54 @@
+"""
+Extracted texts of the bundled corpus, shared by the parser benchmarks.
+Texts are extracted once and kept in a snapshot next to the extraction cache,
+keyed by each PDF's size and mtime, so benchmark runs never touch pypdf/OCR.
+"""
+import json
+from pathlib import Path
+from typing import List, Tuple
+
+from config import CACHE_DIR
+from text_extractor import extract_text
+
+CORPUS_DIR = Path("Telekonyvek/picked_pdfs")
+SNAPSHOT_PATH = Path(CACHE_DIR) / "parser_bench_corpus.json"
+
+
+def _file_key(pdf_path: Path) -> str:
+    stat = pdf_path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def load_texts(pdf_paths: List[Path] = None) -> List[Tuple[str, str]]:
+    """(filename, text) for every PDF with a usable text layer, extracting only new or changed files."""
+    if pdf_paths is None:
+        pdf_paths = sorted(CORPUS_DIR.glob("*.pdf"))
+    try:
+        with open(SNAPSHOT_PATH, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        snapshot = {}
+
+    texts = []
+    changed = False
+    for pdf_path in pdf_paths:
+        key = _file_key(pdf_path)
+        entry = snapshot.get(pdf_path.name)
+        if entry is None or entry["key"] != key:
+            try:
+                text, _ = extract_text(pdf_path)
+            except Exception as e:
+                print(f"skip {pdf_path.name}: {e}")
+                continue
+            entry = snapshot[pdf_path.name] = {"key": key, "text": text}
+            changed = True
+        if entry["text"]:
+            texts.append((pdf_path.name, entry["text"]))
+
+    if changed:
+        SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = SNAPSHOT_PATH.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        tmp_path.replace(SNAPSHOT_PATH)
+    return texts
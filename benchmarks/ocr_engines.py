@@ -0,0 +1,126 @@
+"""
+Per-page OCR latency of each available OCR engine.
+
+Usage (from the repo root):
+    python -m benchmarks.ocr_engines [--repeats N] [--save] [pdf ...]
+Defaults to the first few extracts in Telekonyvek/picked_pdfs.
+Times image_to_string at OCR_DPI. Each page's latency is the best of N
+repeats (OCR timings on a busy machine are noisy). Startup is the engine's
+construction (tesserocr loads the language model there, pytesseract on
+every page).
+
+--save writes the numbers to benchmarks/ocr_baseline.json with the
+environment they were measured in (Tesseract version, OCR_LANG, CPU).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+from config import OCR_DPI, OCR_LANG
+from text_extractor import OCR_ENGINES, iter_page_images
+
+DEFAULT_PDFS = sorted(Path("Telekonyvek/picked_pdfs").glob("*.pdf"))[:5]
+BASELINE_PATH = Path(__file__).with_name("ocr_baseline.json")
+
+
+def render_pages(pdf_paths, dpi):
+    """Rasterize every page once so only OCR time is measured."""
+    images = []
+    for pdf_path in pdf_paths:
+        for _, image in iter_page_images(pdf_path, dpi=dpi):
+            images.append(image.copy())
+    return images
+
+
+def bench_engine(name, images, repeats=1):
+    """
+    Return (startup ms, per-page latencies in ms) of image_to_string;
+    a page's latency is the best of `repeats` runs.
+    """
+    start = time.perf_counter()
+    engine = OCR_ENGINES[name]()
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    latencies = []
+    for image in images:
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            engine.image_to_string(image)
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        latencies.append(best)
+    return startup_ms, latencies
+
+
+def environment():
+    """What the timings depend on, recorded with the saved numbers."""
+    env = {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count(),
+           "ocr_lang": OCR_LANG}
+    try:
+        import tesserocr
+        env["tesserocr"] = tesserocr.tesseract_version().splitlines()[0]
+    except ImportError:
+        env["tesserocr"] = None
+    try:
+        env["tesseract_cli"] = subprocess.run(["tesseract", "--version"], capture_output=True,
+                                              text=True).stdout.splitlines()[0]
+    except (OSError, IndexError):
+        env["tesseract_cli"] = None
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdfs", nargs="*", type=Path, help="PDFs to rasterize (default: first 5 extracts)")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per page, the best one counts")
+    parser.add_argument("--save", action="store_true", help=f"write {BASELINE_PATH.name}")
+    args = parser.parse_args()
+
+    pdf_paths = args.pdfs or DEFAULT_PDFS
+    images = render_pages(pdf_paths, OCR_DPI)
+    if not images:
+        print("No pages rendered")
+        return
+    print(f"{len(images)} pages from {len(pdf_paths)} PDFs at {OCR_DPI} dpi, best of {args.repeats}\n")
+    print(f"{'engine':<15} {'startup':>9} {'mean':>9} {'p50':>9} {'p95':>9}")
+
+    results = {"pdfs": [p.name for p in pdf_paths], "pages": len(images), "dpi": OCR_DPI,
+               "repeats": args.repeats, "environment": environment(), "engines": {}}
+    for name in OCR_ENGINES:
+        try:
+            startup_ms, latencies = bench_engine(name, images, args.repeats)
+        except Exception as e:
+            print(f"{name:<15} unavailable: {e}")
+            continue
+
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        print(f"{name:<15} {startup_ms:>7.0f}ms {statistics.mean(latencies):>7.0f}ms "
+              f"{statistics.median(latencies):>7.0f}ms {p95:>7.0f}ms")
+        results["engines"][name] = {"startup_ms": round(startup_ms, 1),
+                                    "mean_ms": round(statistics.mean(latencies), 1),
+                                    "p50_ms": round(statistics.median(latencies), 1), "p95_ms": round(p95, 1)}
+
+    # Per-page time of each engine against per-page pytesseract
+    reference = results["engines"].get("pytesseract")
+    if reference:
+        print()
+        for name, entry in results["engines"].items():
+            if name != "pytesseract":
+                print(f"{name}: {reference['mean_ms'] / entry['mean_ms']:.2f}x pytesseract per page (mean), "
+                      f"{reference['p50_ms'] / entry['p50_ms']:.2f}x (p50)")
+
+    if args.save:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\nSaved {BASELINE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
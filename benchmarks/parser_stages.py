@@ -0,0 +1,177 @@
+"""
+Per-stage parser benchmark with a regression baseline.
+
+Usage (from the repo root):
+    python -m benchmarks.parser_stages [--repeats N] [--top N] [--save-baseline] [--tolerance 0.25]
+Times clean_text, SectionIndex, each extract_* function and the whole
+parse_record on every document of the corpus (best of N repeats per document),
+then reports docs/s and p50/p95/p99 per stage and the slowest documents.
+
+benchmarks/parser_baseline.json holds the reference numbers. Without
+--save-baseline the run is compared against it and exits with status 1 if a
+stage's total time or p95 grew by more than the tolerance (and by more than
+MIN_DELTA, to ignore timer noise on microsecond stages). Timings depend on
+the machine: refresh the baseline (--save-baseline) when changing hardware.
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import patterns
+from benchmarks.corpus import load_texts
+from parser import (clean_text, extract_cadastral_number, extract_cf_number, extract_constructions,
+                    extract_owner_details, extract_owner_history, extract_parcel_data, extract_sarcini,
+                    extract_uat_locality, parse_record)
+from sections import SectionIndex
+
+BASELINE_PATH = Path(__file__).with_name("parser_baseline.json")
+# Slowdowns below these absolute amounts are timer noise, never regressions
+MIN_DELTA = {"total_s": 0.02, "p95_ms": 0.05}
+
+
+class Document:
+    """A corpus text with the inputs every stage needs, prepared outside the timed calls."""
+
+    def __init__(self, filename: str, text: str):
+        self.filename = filename
+        self.raw = text
+        self.clean = clean_text(text)
+        self.sections = SectionIndex(self.clean)
+        self.part_ii = self.sections.section(self.sections.part_ii)
+        self.cad_num = extract_cadastral_number(self.clean)
+
+
+# (stage name, call) in parse_record order
+STAGES = [
+    ("clean_text", lambda doc: clean_text(doc.raw)),
+    ("extract_cf_number", lambda doc: extract_cf_number(doc.clean)),
+    ("extract_cadastral_number", lambda doc: extract_cadastral_number(doc.clean)),
+    ("extract_uat_locality", lambda doc: extract_uat_locality(doc.clean)),
+    ("SectionIndex", lambda doc: SectionIndex(doc.clean)),
+    ("extract_owner_details", lambda doc: extract_owner_details(doc.clean, doc.sections)),
+    ("extract_owner_history", lambda doc: extract_owner_history(doc.part_ii)),
+    ("extract_parcel_data", lambda doc: extract_parcel_data(doc.clean)),
+    ("extract_sarcini", lambda doc: extract_sarcini(doc.clean, doc.sections)),
+    ("extract_constructions", lambda doc: extract_constructions(doc.clean, doc.cad_num, doc.sections)),
+    ("parse_record", lambda doc: parse_record(doc.filename, doc.raw)),
+]
+
+
+def time_stage(call, docs, repeats):
+    """Best-of-repeats seconds per document."""
+    timings = []
+    for doc in docs:
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            call(doc)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best)
+    return timings
+
+
+def summarize(timings, docs, top):
+    """docs/s, total, p50/p95/p99 (ms) and the slowest documents of one stage."""
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    total = sum(timings)
+    slowest = sorted(range(len(docs)), key=timings.__getitem__, reverse=True)[:top]
+    return {
+        "docs_per_sec": round(len(docs) / total, 1) if total else None,
+        "total_s": round(total, 4),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "slowest": [{"file": docs[i].filename, "ms": round(timings[i] * 1000, 2)} for i in slowest],
+    }
+
+
+def environment():
+    try:
+        import ahocorasick  # noqa: F401
+        keyword_engine = "ahocorasick"
+    except ImportError:
+        keyword_engine = "regex"
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "regex_engine": "re2" if patterns.USE_RE2 else "re",
+        "keyword_engine": keyword_engine,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Human-readable regressions of total time / p95 against the baseline."""
+    regressions = []
+    for name, current in results["stages"].items():
+        reference = baseline["stages"].get(name)
+        if not reference:
+            continue
+        for metric in ("total_s", "p95_ms"):
+            if (reference[metric] and current[metric] > reference[metric] * (1 + tolerance)
+                    and current[metric] - reference[metric] > MIN_DELTA[metric]):
+                regressions.append(f"{name}: {metric} {reference[metric]} -> {current[metric]} "
+                                   f"(+{(current[metric] / reference[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=3, help="timed calls per document and stage (best is kept)")
+    parser.add_argument("--top", type=int, default=5, help="slowest documents listed per stage")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write {BASELINE_PATH.name}")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    texts = load_texts()
+    if len(texts) < 2:
+        print("Not enough texts loaded")
+        return 1
+    docs = [Document(filename, text) for filename, text in texts]
+    print(f"{len(docs)} documents, {sum(len(doc.raw) for doc in docs) / 1e6:.1f}M chars, "
+          f"best of {args.repeats}\n")
+
+    results = {"documents": len(docs), "repeats": args.repeats, "environment": environment(), "stages": {}}
+    print(f"{'stage':<26}{'docs/s':>10}{'total s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, call in STAGES:
+        stats = summarize(time_stage(call, docs, args.repeats), docs, args.top)
+        results["stages"][name] = stats
+        print(f"{name:<26}{stats['docs_per_sec']:>10}{stats['total_s']:>10.3f}"
+              f"{stats['p50_ms']:>9.3f}{stats['p95_ms']:>9.3f}{stats['p99_ms']:>9.3f}")
+
+    print("\nSlowest documents")
+    for name, stats in results["stages"].items():
+        listing = ", ".join(f"{entry['file']} {entry['ms']}ms" for entry in stats["slowest"])
+        print(f"  {name}: {listing}")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return 0
+
+    if not BASELINE_PATH.exists():
+        print("\nNo baseline yet, run with --save-baseline")
+        return 0
+    with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get("environment") != results["environment"]:
+        print(f"\nNote: baseline environment {baseline.get('environment')} differs from this run")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegressions (> {args.tolerance * 100:.0f}% slower than baseline):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+parse_record throughput on the bundled extracts.
+
+Usage (from the repo root):
+    python -m benchmarks.parser_throughput [repeats]
+Texts come from the benchmarks.corpus snapshot, so only parsing is timed.
+Per-stage timings and the regression baseline: benchmarks.parser_stages.
+"""
+import logging
+import statistics
+import sys
+import time
+
+from benchmarks.corpus import load_texts
+from parser import parse_record
+
+
+def main():
+    logging.disable(logging.INFO)
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    texts = load_texts()
+    if not texts:
+        print("No texts loaded")
+        return
+    total_chars = sum(len(text) for _, text in texts)
+    print(f"{len(texts)} documents, {total_chars / 1e6:.1f}M chars, {repeats} runs\n")
+
+    timings = []
+    for run in range(repeats):
+        start = time.perf_counter()
+        for filename, text in texts:
+            parse_record(filename, text)
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        print(f"run {run + 1}: {elapsed:.2f}s  {len(texts) / elapsed:.0f} docs/s")
+
+    best = min(timings)
+    print(f"\nbest {best:.2f}s  {len(texts) / best:.0f} docs/s  "
+          f"median {statistics.median(timings):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
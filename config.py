@@ -2,7 +2,6 @@ import os
 
 INPUT_DIR = "input_pdfs"
 OUTPUT_DIR = "output_excel"
-TEMP_DIR = "temp_images"
 FAILED_LOG = "failed_pdfs.txt"
 
 # Complete column set for Romanian Carte Funciară extraction
@@ -50,3 +49,106 @@ COLUMNS = [
 
 MIN_TEXT_CHARS = 150
 MIN_ALPHA_RATIO = 0.05
+MIN_PAGE_TEXT_CHARS = 20  # Per page: fewer characters means no text layer on that page
+
+# Parallel processing engine ("process" = multi-core pool, "sequential" = single core)
+PROCESSING_ENGINE = os.environ.get("PROCESSING_ENGINE", "process")
+WORKER_COUNT = int(os.environ.get("WORKER_COUNT", os.cpu_count() or 1))
+CHUNK_SIZE = int(os.environ.get("CHUNK_SIZE", 4))  # PDFs handed to a worker at once
+# Two-lane scheduling of processing jobs: every PDF starts in the fast lane (text layer only),
+# documents needing OCR move to a separately sized OCR lane, longest first
+FAST_LANE_WORKERS = int(os.environ.get("FAST_LANE_WORKERS", max(1, WORKER_COUNT // 2)))
+OCR_LANE_WORKERS = int(os.environ.get("OCR_LANE_WORKERS", max(1, WORKER_COUNT - FAST_LANE_WORKERS)))
+# Supervised workers ("process" engine): a document running past DOC_TIMEOUT_SECONDS (0 = unlimited) has its
+# worker and that worker's pdftoppm/tesseract children killed and is reported as TIMEOUT; TIMEOUT_RETRY
+# runs the timed-out files once more at the end of the job. Workers are replaced after WORKER_MAX_TASKS
+# documents or once their RSS exceeds WORKER_MAX_RSS_MB (0 = never), containing pypdf/PIL leaks.
+DOC_TIMEOUT_SECONDS = float(os.environ.get("DOC_TIMEOUT_SECONDS", 300))
+TIMEOUT_RETRY = os.environ.get("TIMEOUT_RETRY", "0") == "1"
+WORKER_MAX_TASKS = int(os.environ.get("WORKER_MAX_TASKS", 200))
+WORKER_MAX_RSS_MB = int(os.environ.get("WORKER_MAX_RSS_MB", 1024))
+# Results store (results.db, SQLite WAL): finished PDFs are committed (and fsynced) every N files and after each batch
+RESULTS_COMMIT_EVERY = int(os.environ.get("RESULTS_COMMIT_EVERY", 20))
+
+# Text-layer backend: "pypdf", "pdftotext" (poppler), "pdfium" (pip install pypdfium2),
+# or "auto" (opt-in) = a self-benchmark at the start of a job picks the fastest backend that parses
+# identically to pypdf on a sample. Only the sample is compared, so a backend can still differ on
+# other documents (pdfium adds a newline to some areas): the default stays pypdf. The choice is
+# stored with the job's results and reused when the job is resumed.
+TEXT_BACKEND = os.environ.get("TEXT_BACKEND", "pypdf")
+TEXT_BACKEND_SAMPLE_SIZE = 10  # PDFs used by the self-benchmark
+TEXT_MAX_PAGES = 10
+PDFTOTEXT_LAYOUT = True  # pdftotext -layout
+
+# OCR rasterization
+OCR_DPI = 300  # Higher DPI for better OCR accuracy
+OCR_MAX_PAGES = 5  # Cadastral extracts are typically 3 pages
+
+# OCR engine: "tesserocr" keeps one Tesseract instance per worker and takes pages in memory (no temp files),
+# "pytesseract" spawns the tesseract CLI per page (temp PNG/text files), "auto" prefers tesserocr when installed
+OCR_ENGINE = os.environ.get("OCR_ENGINE", "auto")
+OCR_LANG = os.environ.get("OCR_LANG", "ron")  # Romanian language pack
+OCR_PSM = 6  # Uniform block of text
+OCR_OEM = 3  # Default engine mode
+
+# Persistent extraction cache (survives /upload-zip wiping input_pdfs)
+CACHE_ENABLED = os.environ.get("CACHE_ENABLED", "1") == "1"
+CACHE_DIR = os.environ.get("CACHE_DIR", "extraction_cache")
+CACHE_MAX_MB = int(os.environ.get("CACHE_MAX_MB", 2048))
+
+# Section-aware early termination: stop reading pages once parse_record has what it needs.
+# All REQUIRED sections must have been seen, then the page holding a STOP marker is the last one read.
+EARLY_STOP_ENABLED = os.environ.get("EARLY_STOP_ENABLED", "1") == "1"
+EARLY_STOP_REQUIRED = [r"C\.\s*Partea\s+III"]  # Encumbrances (Part III)
+EARLY_STOP_MARKERS = [r"Lungime\s+Segmente"]  # Ends the "Date referitoare la constructii" table
+
+# Parse budget: wall-clock limit per document for parse_record (0 = unlimited).
+# Documents over it are reported as PARSE_TIMEOUT instead of stalling a worker.
+PARSE_TIMEOUT_SECONDS = float(os.environ.get("PARSE_TIMEOUT_SECONDS", 20))
+# Regex engine for the backtracking-prone owner patterns: "re2" (pip install google-re2, linear time),
+# "re" (standard library), or "auto" = re2 when installed
+REGEX_ENGINE = os.environ.get("REGEX_ENGINE", "auto")
+
+# Construction classification tables: (label, keywords) in priority order, the first rule with a
+# keyword in the (lowercased) building block wins. Shared by the A1.x and "Date referitoare" formats.
+# CONSTRUCTION_KEYWORDS_FILE may point to a JSON file {"destinations": [[label, [keywords]], ...],
+# "materials": [...]} that replaces these tables.
+CONSTRUCTION_KEYWORDS_FILE = os.environ.get("CONSTRUCTION_KEYWORDS_FILE", "")
+CONSTRUCTION_DESTINATION_DEFAULT = "Cladire"
+CONSTRUCTION_DESTINATIONS = [
+    ("Spatii Comerciale", ["spatii comerciale", "spatiu comercial"]),
+    ("Pensiune", ["pensiune"]),
+    ("Cheu", ["cheu", "bazin"]),
+    ("Vestiar", ["vestiar"]),
+    ("Sediu", ["sediu"]),
+    ("Locuinta", ["casa", "locuinta", "locuințe", "locuinte"]),
+    ("Anexa", ["anexa", "anexe"]),
+    ("Garaj", ["garaj"]),
+    ("Grajd", ["grajd"]),
+    ("Magazie", ["magazie"]),
+    ("Remiza", ["remiza"]),
+    ("Post Trafo", ["post trafo"]),
+    ("Birouri", ["birou"]),
+    ("Cabina", ["cabina"]),
+    ("Punct Termic", ["punct termic"]),
+    ("Industrial", ["industrial", "laborator", "cofetarie"]),
+    ("Atelier", ["atelier"]),
+    ("Depozit", ["depozit"]),
+    ("Hala", ["hala"]),
+    ("Imprejmuire", ["imprejmuire", "gard"]),
+    ("Sopron", ["sopron"]),
+    ("Beci", ["beci", "pivnita"]),
+    ("WC", ["wc", "toaleta"]),
+    ("Terasa", ["terasa"]),
+    ("Centrala", ["centrala"]),
+    ("Statie", ["statie"]),
+    ("Piscina", ["piscina"]),
+    ("Piata", ["piata"]),
+]
+CONSTRUCTION_MATERIALS = [
+    ("Beton", ["beton"]),
+    ("Caramida", ["caramida", "cărămidă"]),
+    ("Lemn", ["lemn"]),
+    ("Paianta", ["paianta", "paiantă"]),
+    ("Metal", ["metal"]),
+]
@@ -0,0 +1,54 @@
+"""
+Streaming Excel export of a job's results store.
+The workbook is written once, row by row, with openpyxl's write-only mode while
+the rows stream out of SQLite already sorted (from the export index), so memory
+stays constant whatever the job size. The file is written under a unique
+temporary name in the same directory and renamed, so a download never sees a
+half-written workbook and concurrent exports (two snapshot requests) do not
+write into each other's file.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from config import COLUMNS
+from results_store import ResultStore
+
+
+def write_excel(store: ResultStore, path: Path) -> int:
+    """
+    Write every stored row to `path`, sorted by Status_Validare (descending)
+    then Numar_CF and file name. Returns the number of rows; nothing is written when there are none.
+    """
+    if not store.has_records():
+        return 0
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    header_font = Font(bold=True)
+    header = []
+    for column in COLUMNS:
+        cell = WriteOnlyCell(sheet, value=column)
+        cell.font = header_font
+        header.append(cell)
+    sheet.append(header)
+
+    count = 0
+    for row in store.iter_rows(COLUMNS):
+        sheet.append(row)
+        count += 1
+
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    try:
+        workbook.save(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return count
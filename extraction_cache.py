@@ -0,0 +1,97 @@
+"""
+Persistent content-addressed cache for extracted PDF text.
+Key = SHA-256 of the PDF bytes + extractor version, so re-uploaded extracts skip pypdf/OCR.
+"""
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_pdf(pdf_path: Path) -> str:
+    """SHA-256 hex digest of the file contents."""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    On-disk cache of (text, used_ocr) per PDF.
+    One JSON file per entry; reads refresh the file mtime, which drives LRU eviction.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(pdf_path: Path, version: str) -> str:
+        """Cache key for a PDF under a given extractor version."""
+        return hashlib.sha256(f"{hash_pdf(pdf_path)}:{version}".encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[str, bool]]:
+        """Return cached (text, used_ocr) or None."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry["text"], entry["used_ocr"]
+
+    def put(self, key: str, text: str, used_ocr: bool):
+        """Store an entry atomically (safe with several worker processes)."""
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"text": text, "used_ocr": used_ocr}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Cache write failed for {key}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        if total <= self.max_bytes:
+            return 0
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        logging.info(f"Extraction cache: evicted {removed} entries")
+        return removed
@@ -0,0 +1,96 @@
+"""
+Table-driven keyword classifier (construction destination and material).
+A priority-ordered list of (label, keywords) rules is compiled into one
+multi-pattern automaton, so a chunk is scanned once however many keywords the
+table holds. Uses pyahocorasick when installed (pip install pyahocorasick),
+otherwise a single regex alternation.
+"""
+import json
+import logging
+import re
+from typing import Dict, Iterator, Sequence, Tuple
+
+from config import (CONSTRUCTION_DESTINATIONS, CONSTRUCTION_DESTINATION_DEFAULT,
+                    CONSTRUCTION_KEYWORDS_FILE, CONSTRUCTION_MATERIALS)
+
+Rules = Sequence[Tuple[str, Sequence[str]]]
+
+
+class KeywordClassifier:
+    """
+    Classifies lowercase text: the first rule (in table order) with any of its
+    keywords occurring in the text wins, otherwise `default`.
+    """
+
+    def __init__(self, rules: Rules, default: str = ""):
+        self.labels = [label for label, _ in rules]
+        self.default = default
+
+        # Keyword -> index of the first rule listing it
+        self._priority: Dict[str, int] = {}
+        for idx, (_, keywords) in enumerate(rules):
+            for keyword in keywords:
+                if keyword:
+                    self._priority.setdefault(keyword.lower(), idx)
+
+        try:
+            import ahocorasick
+        except ImportError:
+            ahocorasick = None
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, idx in self._priority.items():
+                self._automaton.add_word(keyword, idx)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            # The lookahead reports the longest keyword starting at each position; every
+            # shorter keyword matching there is a prefix of it, so its best priority covers them
+            keywords = sorted(self._priority, key=len, reverse=True)
+            self._pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+            self._prefix_priority = {
+                keyword: min(idx for other, idx in self._priority.items() if keyword.startswith(other))
+                for keyword in keywords
+            }
+
+    def _matched_rules(self, text: str) -> Iterator[int]:
+        if self._automaton is not None:
+            for _, idx in self._automaton.iter(text):
+                yield idx
+        else:
+            for match in self._pattern.finditer(text):
+                yield self._prefix_priority[match.group(1)]
+
+    def classify(self, text: str) -> str:
+        if not self._priority:
+            return self.default
+        best = len(self.labels)
+        for idx in self._matched_rules(text):
+            if idx < best:
+                best = idx
+                if best == 0:
+                    break
+        return self.labels[best] if best < len(self.labels) else self.default
+
+
+def load_keyword_tables() -> Tuple[Rules, Rules]:
+    """(destinations, materials) from CONSTRUCTION_KEYWORDS_FILE if set, else from config."""
+    destinations, materials = CONSTRUCTION_DESTINATIONS, CONSTRUCTION_MATERIALS
+    if CONSTRUCTION_KEYWORDS_FILE:
+        try:
+            with open(CONSTRUCTION_KEYWORDS_FILE, 'r', encoding='utf-8') as f:
+                tables = json.load(f)
+            destinations = [(label, keywords) for label, keywords in tables.get("destinations", destinations)]
+            materials = [(label, keywords) for label, keywords in tables.get("materials", materials)]
+        except (OSError, ValueError) as e:
+            logging.warning(f"Keyword table {CONSTRUCTION_KEYWORDS_FILE} not loaded ({e}), using defaults")
+            destinations, materials = CONSTRUCTION_DESTINATIONS, CONSTRUCTION_MATERIALS
+    return destinations, materials
+
+
+def build_construction_classifiers() -> Tuple[KeywordClassifier, KeywordClassifier]:
+    """(destination, material) classifiers shared by both construction formats."""
+    destinations, materials = load_keyword_tables()
+    return (KeywordClassifier(destinations, CONSTRUCTION_DESTINATION_DEFAULT),
+            KeywordClassifier(materials))
@@ -1,9 +1,10 @@
 import os
 import pandas as pd
 from pathlib import Path
-from config import INPUT_DIR, OUTPUT_DIR, COLUMNS, TEMP_DIR
+from config import INPUT_DIR, OUTPUT_DIR, COLUMNS
 from text_extractor import extract_text
 from parser import parse_record
+from records import to_rows
 from validator import validate_row
 
 def process_batch():
@@ -11,7 +12,6 @@ def process_batch():
     output_path = Path(OUTPUT_DIR)
     input_path.mkdir(parents=True, exist_ok=True)
     output_path.mkdir(parents=True, exist_ok=True)
-    Path(TEMP_DIR).mkdir(parents=True, exist_ok=True)
 
     all_pdfs = list(input_path.glob("*.pdf"))
     print(f"=== STARTED PROCESSING {len(all_pdfs)} FILES ===")
@@ -21,14 +21,14 @@ def process_batch():
     for i, pdf_file in enumerate(all_pdfs, 1):
         try:
             print(f"[{i}/{len(all_pdfs)}] Processing: {pdf_file.name}")
-            text, _ = extract_text(pdf_file, Path(TEMP_DIR))
+            text, _ = extract_text(pdf_file)
             
             if text:
                 records = parse_record(pdf_file.name, text)
                 for record in records:
                     status, msg = validate_row(record)
-                    record['Status_Validare'] = status
-                    record['Mesaj_Eroare'] = msg
+                    record.Status_Validare = status
+                    record.Mesaj_Eroare = msg
                     all_data.append(record)
             else:
                 print(f"   [WARN] No text found in {pdf_file.name}")
@@ -37,7 +37,7 @@ def process_batch():
             print(f"   [ERROR] Failed: {e}")
 
     if all_data:
-        df = pd.DataFrame(all_data, columns=COLUMNS)
+        df = pd.DataFrame(to_rows(all_data), columns=COLUMNS)
         # Sort "VERIFICA" to top
         df = df.sort_values(by=['Status_Validare', 'Numar_CF'], ascending=[False, True])
         
@@ -53,26 +53,25 @@ def process_pdfs_from_dir(input_dir, output_dir):
     input_path = Path(input_dir)
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
-    Path(TEMP_DIR).mkdir(parents=True, exist_ok=True)
     
     all_pdfs = list(input_path.glob("*.pdf"))
     all_data = []
     
     for pdf_file in all_pdfs:
         try:
-            text, _ = extract_text(pdf_file, Path(TEMP_DIR))
+            text, _ = extract_text(pdf_file)
             if text:
                 records = parse_record(pdf_file.name, text)
                 for record in records:
                     status, msg = validate_row(record)
-                    record['Status_Validare'] = status
-                    record['Mesaj_Eroare'] = msg
+                    record.Status_Validare = status
+                    record.Mesaj_Eroare = msg
                     all_data.append(record)
         except Exception:
             pass
     
     if all_data:
-        df = pd.DataFrame(all_data, columns=COLUMNS)
+        df = pd.DataFrame(to_rows(all_data), columns=COLUMNS)
         df = df.sort_values(by=['Status_Validare', 'Numar_CF'], ascending=[False, True])
         df.to_excel(output_path / "cadastral_data.xlsx", index=False)
     
@@ -0,0 +1,85 @@
+"""
+Text normalization, one stage per step of the pipeline:
+- OCR_FIXES (text_extractor, per OCR page): cedilla -> comma-below forms, '|' -> 'I'
+- PARSE_FOLD (parser.clean_text): all Romanian diacritics -> ASCII, drops '\\r',
+  tabs -> spaces; runs of spaces are then collapsed to one.
+The tables are str.maketrans mappings. On text containing any non-ASCII
+character str.translate falls back to a per-character lookup (about 30x slower
+than str.replace on the extracts), so translate() applies a table with one
+str.replace per character actually present in the text.
+parse_normalize can also return an offset map from the normalized text back to
+the raw text, for reporting match positions in the original document.
+"""
+import re
+from array import array
+from typing import Tuple, Union
+
+OCR_FIXES = str.maketrans({
+    'ţ': 'ț',  # t-cedilla to t-comma-below
+    'ş': 'ș',  # s-cedilla to s-comma-below
+    'Ţ': 'Ț',  # T-cedilla to T-comma-below
+    'Ş': 'Ș',  # S-cedilla to S-comma-below
+    '|': 'I',  # Common OCR mistake: pipe to I
+})
+
+# Both cedilla and comma-below variants fold to ASCII
+PARSE_FOLD = str.maketrans({
+    'ţ': 't', 'ț': 't', 'ş': 's', 'ș': 's', 'ă': 'a', 'â': 'a', 'î': 'i',
+    'Ţ': 'T', 'Ț': 'T', 'Ş': 'S', 'Ș': 'S', 'Ă': 'A', 'Â': 'A', 'Î': 'I',
+    '\r': None,
+    '\t': ' ',
+})
+
+SPACE_RUN = re.compile(' {2,}')
+
+
+def translate(text: str, table: dict) -> str:
+    """
+    text.translate(table), without str.translate's slow non-ASCII path.
+    Equivalent as long as no replacement contains a key of the table.
+    """
+    if text.isascii():
+        return text.translate(table)
+    for code, replacement in table.items():
+        char = chr(code)
+        if char in text:
+            text = text.replace(char, replacement or "")
+    return text
+
+
+def ocr_normalize(text: str) -> str:
+    """Fix common OCR misreads in Romanian text."""
+    if not text:
+        return ""
+    return translate(text, OCR_FIXES)
+
+
+def parse_normalize(text: str, keep_offsets: bool = False) -> Union[str, Tuple[str, array]]:
+    """
+    ASCII-folded text with horizontal whitespace runs collapsed.
+    With keep_offsets, also returns offsets where offsets[i] is the position in
+    `text` of normalized character i.
+    """
+    if not text:
+        return ("", array('l')) if keep_offsets else ""
+    folded = translate(text, PARSE_FOLD)
+    normalized = SPACE_RUN.sub(' ', folded) if '  ' in folded else folded
+    if not keep_offsets:
+        return normalized
+    return normalized, _offset_map(text)
+
+
+def _offset_map(text: str) -> array:
+    """Raw position of every character parse_normalize keeps (slow path, on request only)."""
+    offsets = array('l')
+    previous_space = False
+    for pos, ch in enumerate(text):
+        mapped = PARSE_FOLD.get(ord(ch), ch)
+        if mapped is None:
+            continue
+        is_space = mapped == ' '
+        if is_space and previous_space:
+            continue
+        previous_space = is_space
+        offsets.append(pos)
+    return offsets
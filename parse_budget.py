@@ -0,0 +1,49 @@
+"""
+Per-document wall-clock budget for parse_record.
+On the main thread (worker processes, CLI) a SIGALRM timer interrupts even a
+regex stuck in backtracking: the re engine checks for signals while matching.
+Elsewhere (the Flask background thread) signals are unavailable, so the parser
+checks the deadline cooperatively between stages instead.
+"""
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+class ParseTimeout(Exception):
+    """parse_record exceeded its time budget."""
+
+
+def _on_alarm(signum, frame):
+    raise ParseTimeout()
+
+
+def check_deadline():
+    """Raise ParseTimeout if the current budget has run out (no-op without a budget)."""
+    deadline = getattr(_local, "deadline", None)
+    if deadline is not None and time.monotonic() > deadline:
+        raise ParseTimeout()
+
+
+@contextmanager
+def parse_deadline(seconds: float):
+    """Limit the wrapped block to `seconds` of wall-clock time (0 = unlimited)."""
+    if seconds <= 0:
+        yield
+        return
+
+    _local.deadline = time.monotonic() + seconds
+    use_alarm = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+        _local.deadline = None
@@ -1,18 +1,20 @@
-import re
 from typing import List, Dict, Tuple
 
+import patterns
+from keywords import build_construction_classifiers
+from normalize import parse_normalize
+from parse_budget import check_deadline
+from records import BuildingRecord, ParcelRecord
+from sections import SectionIndex
+
+DESTINATION_CLASSIFIER, MATERIAL_CLASSIFIER = build_construction_classifiers()
+
 def clean_text(text: str) -> str:
-    """Standardize text for easier regex matching."""
-    if not text: return ""
-    text = text.replace('\r', '')
-    # Replace ALL Romanian diacritic variants (both cedilla AND comma-below forms)
-    text = text.replace('ţ', 't').replace('ș', 's').replace('ş', 's').replace('ă', 'a').replace('î', 'i').replace('â', 'a').replace('ț', 't')
-    text = text.replace('Ţ', 'T').replace('Ș', 'S').replace('Ş', 'S').replace('Ă', 'A').replace('Î', 'I').replace('Â', 'A').replace('Ț', 'T')
-    text = re.sub(r'[ \t]+', ' ', text)
-    return text
+    """Standardize text for easier regex matching (diacritics folded to ASCII, spaces collapsed)."""
+    return parse_normalize(text)
 
 def extract_cf_number(text: str) -> str:
-    match = re.search(r"CARTE\s+FUNCIAR[AĂ]\s+NR\.?\s+(\d+)", text, re.IGNORECASE)
+    match = patterns.CF_NUMBER.search(text)
     return match.group(1) if match else "Nedetectat"
 
 def extract_uat_locality(text: str) -> Tuple[str, str]:
@@ -20,11 +22,11 @@ def extract_uat_locality(text: str) -> Tuple[str, str]:
     uat = ""
     localitate = ""
     
-    uat_match = re.search(r"(?:UAT|Comuna|Oras|Municipiu)[:\s]+([A-Z][a-zA-Z\s\-]+)", text)
+    uat_match = patterns.UAT.search(text)
     if uat_match:
         uat = uat_match.group(1).strip()
     
-    loc_match = re.search(r"Loc\.\s*([A-Z][a-zA-Z\s\-]+)", text)
+    loc_match = patterns.LOCALITY.search(text)
     if loc_match:
         localitate = loc_match.group(1).strip()
     
@@ -32,28 +34,30 @@ def extract_uat_locality(text: str) -> Tuple[str, str]:
 
 def extract_cadastral_number(text: str) -> str:
     # Matches A1 followed by number, IGNORING quotes/commas
-    a1_match = re.search(r"\bA1[^\d\n]*([0-9\-/]+)", text)
+    a1_match = patterns.A1_CADASTRAL.search(text)
     if a1_match:
         return a1_match.group(1)
     
-    cad_match = re.search(r"Nr\.?\s*(?:cadastral|topografic).*?(\d+[0-9\-/]*)", text, re.IGNORECASE)
+    cad_match = patterns.CADASTRAL_LABEL.search(text)
     if cad_match:
         if "vechi" not in cad_match.group(0).lower():
             return cad_match.group(1)
     return "Nedetectat"
 
-def extract_owner_details(text: str) -> Tuple[str, str, str, str]:
+def extract_owner_details(text: str, sections: SectionIndex = None) -> Tuple[str, str, str, str]:
     """
     Extracts Owner Name, Quota, Mode of Acquisition, and Act.
     Handles: person names, company names (S.A., S.R.L.), municipalities, state entities, etc.
     Strategy: Find the LAST valid Intabulare block (cota != 0/1) and extract owners from there.
     """
-    # Fixed regex: read B section until C. Partea III (not stopping at "Anexa" in middle of text)
-    part_ii_match = re.search(r"B\.\s*Partea\s+II.*?(?=C\.\s*Partea\s+III)", text, re.IGNORECASE | re.DOTALL)
-    if not part_ii_match:
+    if sections is None:
+        sections = SectionIndex(text)
+
+    # B section runs until C. Partea III (not stopping at "Anexa" in middle of text)
+    if not sections.part_ii:
         return "Fara proprietar identificat", "", "", "", ""
     
-    part_ii = part_ii_match.group(0)
+    part_ii = sections.section(sections.part_ii)
     
     if "proprietar neidentificat" in part_ii.lower():
         return "Proprietar neidentificat", "1/1", "Lege", "", ""
@@ -66,32 +70,14 @@ def extract_owner_details(text: str) -> Tuple[str, str, str, str]:
     best_owners = []
     best_cota = ""
     
-    # Find all Intabulare blocks with their content
-    # Pattern: B\d+ ... Intabulare ... owners ... until next B\d+ or end
-    intabulare_blocks = list(re.finditer(
-        r'B(\d+)\s+(?:Intabulare|intabulare)',
-        part_ii
-    ))
-    
-    for idx, ib_match in enumerate(intabulare_blocks):
-        b_num = ib_match.group(1)
-        start = ib_match.start()
-        
-        # Find end of this block (next B-block or end of Part II)
-        if idx + 1 < len(intabulare_blocks):
-            end = intabulare_blocks[idx + 1].start()
-        else:
-            # Find next major section marker
-            next_section = re.search(r'\n(?:B\d+\s)', part_ii[ib_match.end():])
-            if next_section:
-                end = ib_match.end() + next_section.start()
-            else:
-                end = len(part_ii)
+    # Intabulare blocks (B<n> ... until the next B<n> or end of Part II) come from the section index
+    for owner_block in sections.owner_blocks:
+        block = text[owner_block.start:owner_block.end]
         
-        block = part_ii[start:end]
+        check_deadline()
         
         # Skip blocks that are "se noteaza" (notes, not ownership)
-        if re.search(r'B\d+\s+se\s+noteaza', block, re.IGNORECASE):
+        if patterns.SE_NOTEAZA.search(block):
             continue
         
         # Skip SERVITUTE blocks
@@ -99,26 +85,23 @@ def extract_owner_details(text: str) -> Tuple[str, str, str, str]:
             continue
         
         # Check if this block has been radiata (cancelled)
-        if re.search(r'Radiat[a|ă]?\s+prin', block, re.IGNORECASE):
+        if patterns.RADIATA.search(block):
             continue
         
         # Check cota - skip blocks with cota actuala 0/1 (transferred ownership)
-        cota_match = re.search(r'cota\s+actuala\s+(\d+/\d+)', block, re.IGNORECASE)
+        cota_match = patterns.COTA_ACTUALA.search(block)
         if cota_match and cota_match.group(1) == '0/1':
             continue
         
         # Extract numbered owners from this block: 1) NAME, 2) NAME, etc.
         block_owners = []
-        owner_matches = re.finditer(
-            r'(\d+)\)\s*([A-Za-z][A-Za-z\s\.\,\-\"\'\(\)]+?)(?=\n\d+\)|\n\d{4,6}\s*/|\n(?:Act|OBSERV|B\d|A\d|Radiat|Document|se\s+noteaz)|\Z)',
-            block
-        )
+        owner_matches = patterns.BLOCK_OWNER.finditer(block)
         
         for om in owner_matches:
             clean_name = om.group(2).strip()
             # Clean up trailing info
-            clean_name = re.sub(r',\s*(?:casatorit|necasatorit|ca\s+bun|bun\s+comun|bun\s+propriu|domeniu\s+privat).*$', '', clean_name, flags=re.IGNORECASE)
-            clean_name = re.sub(r',\s*$', '', clean_name).strip()
+            clean_name = patterns.OWNER_TRAILER.sub('', clean_name)
+            clean_name = patterns.TRAILING_COMMA.sub('', clean_name).strip()
             
             if len(clean_name) > 2 and "INTABULARE" not in clean_name.upper() and "DREPT DE" not in clean_name.upper():
                 if clean_name not in block_owners:
@@ -130,7 +113,7 @@ def extract_owner_details(text: str) -> Tuple[str, str, str, str]:
                 best_cota = cota_match.group(1)
             else:
                 # Try to find cota anywhere in block
-                any_cota = re.search(r'cota\s+(?:actuala\s+)?(\d+/\d+)', block, re.IGNORECASE)
+                any_cota = patterns.COTA_ANY.search(block)
                 if any_cota:
                     best_cota = any_cota.group(1)
     
@@ -140,38 +123,26 @@ def extract_owner_details(text: str) -> Tuple[str, str, str, str]:
     
     # Fallback 1: Simple numbered pattern anywhere in Part II
     if not owners:
-        numbered_matches = re.finditer(
-            r'(\d+)\)\s*([A-Za-z][A-Za-z\s\.\,\-\"\'\(\)]+?)(?=\n\d+\)|\n\d{4,6}\s*/|\n(?:Act|OBSERV|B\d|A\d|Radiat|Document)|\Z)',
-            part_ii
-        )
+        numbered_matches = patterns.NUMBERED_OWNER.finditer(part_ii)
         for om in numbered_matches:
             clean_name = om.group(2).strip()
-            clean_name = re.sub(r',\s*(?:casatorit|necasatorit|ca\s+bun|bun\s+comun|bun\s+propriu|domeniu\s+privat).*$', '', clean_name, flags=re.IGNORECASE)
-            clean_name = re.sub(r',\s*$', '', clean_name).strip()
+            clean_name = patterns.OWNER_TRAILER.sub('', clean_name)
+            clean_name = patterns.TRAILING_COMMA.sub('', clean_name).strip()
             if len(clean_name) > 2 and "INTABULARE" not in clean_name.upper() and "DREPT DE" not in clean_name.upper():
                 if clean_name not in owners:
                     owners.append(clean_name)
     
     # Fallback 2: Special entities - STATE, AGENCIES, etc.
     if not owners:
-        state_patterns = [
-            r'(STATUL\s+ROMAN)',
-            r'(AGENTIA\s+DOMENIILOR\s+STATULUI)',
-            r'(ADMINISTRATIA\s+NATIONALA[^,\n]*)',
-            r'(REGIA\s+NATIONALA[^,\n]*)',
-            r'(SOCIETATEA\s+NATIONALA[^,\n]*)',
-            r'(CONSILIUL\s+LOCAL[^,\n]*)',
-            r'(PRIMARIA[^,\n]*)',
-        ]
-        for pattern in state_patterns:
-            match = re.search(pattern, part_ii, re.IGNORECASE)
+        for pattern in patterns.STATE_OWNERS:
+            match = pattern.search(part_ii)
             if match:
                 owners.append(match.group(1).strip())
                 break
     
     # Fallback 3: Companies (S.A., S.R.L.) — require word boundary on SA/SRL to avoid false matches
     if not owners:
-        company_match = re.search(r'(?:S\.C\.\s*)?([A-ZĂÂÎȘȚa-zăâîșț\s\.\-]+(?:S\.A\.|S\.R\.L\.|\bSA\b|\bSRL\b))', part_ii)
+        company_match = patterns.COMPANY_OWNER.search(part_ii)
         if company_match:
             name = company_match.group(1).strip()
             if len(name) > 3:  # Must be more than just "SA"
@@ -179,20 +150,19 @@ def extract_owner_details(text: str) -> Tuple[str, str, str, str]:
     
     # Fallback 4: Municipalities
     if not owners:
-        muni_match = re.search(r'((?:MUNICIPIUL|JUDETUL|COMUNA|ORASUL|Municipiul|Judetul|Comuna|Orasul)\s+[A-Za-z]+)', part_ii)
+        muni_match = patterns.MUNICIPALITY_OWNER.search(part_ii)
         if muni_match:
             owners.append(muni_match.group(1).strip())
     
     # Fallback 5: Search in full text for MUNICIPIUL with uppercase city name
     if not owners:
-        muni_full = re.search(r'((?:MUNICIPIUL|JUDETUL|COMUNA|ORASUL)\s+[A-Z]+)', text)
+        muni_full = patterns.MUNICIPALITY_UPPER.search(text)
         if muni_full:
             owners.append(muni_full.group(1).strip())
     
     # Fallback 6: Person names - UPPERCASE format "LASTNAME FIRSTNAME"
     if not owners:
-        person_pattern = r'1\)\s*([A-Z][A-Z\-]+\s+[A-Z][A-Za-z\-]+)'
-        person_match = re.search(person_pattern, part_ii)
+        person_match = patterns.PERSON_OWNER.search(part_ii)
         if person_match:
             owners.append(person_match.group(1).strip())
     
@@ -201,7 +171,7 @@ def extract_owner_details(text: str) -> Tuple[str, str, str, str]:
     # 2. Extract Cota (use best_cota from block analysis, or find in whole section)
     cota = best_cota
     if not cota:
-        cota_match = re.search(r"cota\s+(?:actuala\s+)?(\d+/\d+)", part_ii, re.IGNORECASE)
+        cota_match = patterns.COTA_ANY.search(part_ii)
         if cota_match:
             cota = cota_match.group(1)
 
@@ -216,7 +186,7 @@ def extract_owner_details(text: str) -> Tuple[str, str, str, str]:
 
     # 4. Act
     act = ""
-    act_match = re.search(r"(Act\s+(?:Notarial|Administrativ|Judecatoresc)[^\n]+)", part_ii, re.IGNORECASE)
+    act_match = patterns.ACT.search(part_ii)
     if act_match:
         act = act_match.group(1).strip()[:50] 
 
@@ -235,7 +205,7 @@ def extract_owner_history(part_ii: str) -> str:
     
     # Find all B blocks with dates: "12345 / DD/MM/YYYY" followed by owner info
     # Pattern: number / date + block until next number/date or end
-    blocks = re.split(r'(\d{4,6}\s*/\s*\d{2}/\d{2}/\d{4})', part_ii)
+    blocks = patterns.REGISTRATION_SPLIT.split(part_ii)
     
     for i in range(1, len(blocks), 2):
         if i+1 >= len(blocks):
@@ -245,7 +215,7 @@ def extract_owner_history(part_ii: str) -> str:
         block_content = blocks[i+1]
         
         # Extract date
-        date_match = re.search(r'(\d{2})/(\d{2})/(\d{4})', date_str)
+        date_match = patterns.DMY_DATE.search(date_str)
         if not date_match:
             continue
         day, month, year = date_match.groups()
@@ -259,18 +229,14 @@ def extract_owner_history(part_ii: str) -> str:
         block_owners = []
         
         # Find numbered owners: 1), 2), 3), etc.
-        owner_matches = re.findall(
-            r'(\d+)\)\s*([A-Za-z][A-Za-z\s\.\,\-\"\'\(\)]+?)(?=\n(?:\d+\)|Act|OBSERV|B\d|A\d|Document|se\s+noteaza)|\n\d{4,6}\s*/|\Z)',
-            block_content
-        )
+        owner_matches = patterns.HISTORY_OWNER.findall(block_content)
         
         for num, owner_name in owner_matches:
             clean_name = owner_name.strip()
             # Clean up trailing commas and common words
-            clean_name = re.sub(r',\s*domeniu\s+privat.*$', '', clean_name, flags=re.IGNORECASE)
-            clean_name = re.sub(r',\s*in\s+indiviziune.*$', '', clean_name, flags=re.IGNORECASE)
-            clean_name = re.sub(r',\s*casatorit.*$', '', clean_name, flags=re.IGNORECASE)
-            clean_name = re.sub(r',\s*$', '', clean_name).strip()
+            for trailer in patterns.HISTORY_TRAILERS:
+                clean_name = trailer.sub('', clean_name)
+            clean_name = patterns.TRAILING_COMMA.sub('', clean_name).strip()
             
             if clean_name and len(clean_name) > 2 and "INTABULARE" not in clean_name.upper():
                 if clean_name not in block_owners:
@@ -288,19 +254,20 @@ def extract_owner_history(part_ii: str) -> str:
     
     return ""
 
-def extract_sarcini(text: str) -> str:
+def extract_sarcini(text: str, sections: SectionIndex = None) -> str:
     """Extracts Encumbrances (Part III)."""
-    part_iii_match = re.search(r"C\.\s*Partea\s+III.*?(?=Anexa|Certificat|\Z)", text, re.IGNORECASE | re.DOTALL)
-    if not part_iii_match:
+    if sections is None:
+        sections = SectionIndex(text)
+    if not sections.part_iii:
         return ""
     
-    part_iii = part_iii_match.group(0)
+    part_iii = sections.section(sections.part_iii)
     if "NU SUNT" in part_iii:
         return "NU SUNT"
     
     sarcini = []
     if "IPOTECA" in part_iii.upper():
-        bank = re.search(r"(?:Banca|BCR|BRD|CEC|Raiffeisen|ING)[^\n]*", part_iii, re.IGNORECASE)
+        bank = patterns.BANK.search(part_iii)
         if bank:
             sarcini.append(f"Ipoteca: {bank.group(0).strip()}")
         else:
@@ -318,40 +285,40 @@ def extract_parcel_data(text: str) -> Tuple[str, str, str]:
     obs = ""
 
     # Obs
-    if re.search(r"Teren\s+neimprejmuit", text, re.IGNORECASE): obs = "Teren neimprejmuit"
-    elif re.search(r"Teren\s+imprejmuit", text, re.IGNORECASE): obs = "Teren imprejmuit"
+    if patterns.TEREN_NEIMPREJMUIT.search(text): obs = "Teren neimprejmuit"
+    elif patterns.TEREN_IMPREJMUIT.search(text): obs = "Teren imprejmuit"
     
     if not obs:
-        match = re.search(r"A1[^\w\n]+[0-9\-/]+[^\w\n]+[\d\.]+[^\w\n]+(.*?)(?=\s+Adresa|\s+Jud\.|\s+B\.|\s+Partea|\Z)", text, re.DOTALL)
+        match = patterns.A1_OBS.search(text)
         if match:
             raw_obs = match.group(1).strip().replace(';', '').replace('"', '')
             if len(raw_obs) < 50: obs = raw_obs
 
     # Surfaces
-    masurata = re.search(r"Masurata:?\s*(\d+[\.\s]?\d*)", text, re.IGNORECASE)
+    masurata = patterns.MASURATA.search(text)
     if masurata: measured = masurata.group(1).replace('.', '').replace(' ', '')
 
-    din_acte = re.search(r"Din\s+acte:?\s*(\d+[\.\s]?\d*)", text, re.IGNORECASE)
+    din_acte = patterns.DIN_ACTE.search(text)
     if din_acte: doc_surf = din_acte.group(1).replace('.', '').replace(' ', '')
 
     # If no measured surface found, try table format
     if not measured:
         # Pattern 1: A1 with number on same line
-        table_match = re.search(r"A1[^\d\n]+[0-9\-/]+[^\d\n]+(\d{1,3}(?:\.\d{3})*)", text)
+        table_match = patterns.A1_TABLE_SURFACE.search(text)
         if table_match: measured = table_match.group(1).replace('.', '')
     
     # Pattern 2: Multi-line format where surface is on next line after cadastral number
     # Example: "A1 CAD: 6886-\n5094/1 965\n" -> surface is 965
     if not measured:
-        multi_line = re.search(r"A1\s+(?:CAD:?\s*)?[\d\-/]+[\s\-]*\n[\d/]+\s+(\d{2,6})\s*\n", text)
+        multi_line = patterns.A1_MULTILINE_SURFACE.search(text)
         if multi_line:
             measured = multi_line.group(1)
     
     # Pattern 3: Just look for standalone number after A1 line
     if not measured:
-        a1_section = re.search(r"A1\s.*?(?=B\.\s*Partea)", text, re.DOTALL)
+        a1_section = patterns.A1_SECTION.search(text)
         if a1_section:
-            nums = re.findall(r'\s(\d{2,6})\s', a1_section.group(0))
+            nums = patterns.SPACED_NUMBER.findall(a1_section.group(0))
             for n in nums:
                 if 10 <= int(n) <= 500000:  # Reasonable surface range
                     measured = n
@@ -359,20 +326,21 @@ def extract_parcel_data(text: str) -> Tuple[str, str, str]:
 
     return measured, doc_surf, obs
 
-def extract_constructions(text: str, cad_base: str) -> List[Dict]:
+def extract_constructions(text: str, cad_base: str, sections: SectionIndex = None) -> List[Dict]:
     """Extract construction data from the document."""
+    if sections is None:
+        sections = SectionIndex(text)
     buildings = []
     
     # FIRST: Check for A1.x format in "A. Partea I" section (embedded constructions)
     # This format often has MORE buildings than "Date referitoare" section
     # Format: A1.1 31573-C1 ... \n ... \n Nr. niveluri:1; S. construita la sol:20 mp; ... \n REMIZA P.S.I.
-    part_a = re.search(r'A\.\s*Partea\s+I.*?(?=B\.\s*Partea\s+II)', text, re.IGNORECASE | re.DOTALL)
-    if part_a:
-        part_a_text = part_a.group(0)
+    if sections.part_i:
+        part_a_text = sections.section(sections.part_i)
         
         # Find all A1.x blocks - each block spans multiple lines until the next A1.x
         # Handle variants: A1.1 XXX-C1, *A1.1 CAD: XXX-C1, A1.1 CAD: XXX-C1
-        a1x_starts = list(re.finditer(r'\*?A1\.(\d+)\s+(?:CAD:\s*)?(\d+-C\d+)', part_a_text))
+        a1x_starts = list(patterns.A1X_START.finditer(part_a_text))
         
         if a1x_starts:
             for i, match in enumerate(a1x_starts):
@@ -391,105 +359,69 @@ def extract_constructions(text: str, cad_base: str) -> List[Dict]:
                 
                 # Extract surface from block - "S. construita la sol:XX mp" (may have decimals)
                 surface = ""
-                surf_match = re.search(r'S\.\s*construita\s+la\s+sol:\s*(\d+(?:[.,]\d+)?)\s*mp', block, re.IGNORECASE)
+                surf_match = patterns.SURFACE_AT_GROUND.search(block)
                 if surf_match:
                     # Round to integer
                     surface = str(int(round(float(surf_match.group(1).replace(',', '.')))))
                 
                 # Pattern 2: "suprafata construita de XXX mp" or "in suprafata de XXX mp"
                 if not surface:
-                    inline_match = re.search(r'(?:suprafata|suprafață)\s+(?:construita\s+)?de\s+(\d+(?:[.,]\d+)?)\s*m\.?p', block, re.IGNORECASE)
+                    inline_match = patterns.SURFACE_INLINE.search(block)
                     if inline_match:
                         surface = str(int(round(float(inline_match.group(1).replace(',', '.')))))
                 
                 # Pattern 3: "s.c. de XXX m.p."
                 if not surface:
-                    sc_match = re.search(r's\.c\.?\s+de\s+(\d+(?:[.,]\d+)?)\s*m\.?p', block, re.IGNORECASE)
+                    sc_match = patterns.SURFACE_SC.search(block)
                     if sc_match:
                         surface = str(int(round(float(sc_match.group(1).replace(',', '.')))))
                 
                 # Extract S. construita desfasurata
                 surf_desf = ""
-                desf_match = re.search(r'desfasurata:?\s*(\d+(?:\.\d+)?)\s*mp', block, re.IGNORECASE)
+                desf_match = patterns.DESFASURATA.search(block)
                 if desf_match:
                     surf_desf = str(int(round(float(desf_match.group(1)))))
                 # Also check for "Sup.desfasurata=XXX mp" format
                 if not surf_desf:
-                    desf_match2 = re.search(r'Sup\.?\s*desfasurata\s*=\s*(\d+)', block, re.IGNORECASE)
+                    desf_match2 = patterns.DESFASURATA_EQ.search(block)
                     if desf_match2:
                         surf_desf = desf_match2.group(1)
                 
                 # Extract nr niveluri
                 nr_niv = ""
-                niv_match = re.search(r'Nr\.\s*niveluri:\s*(\d+)', block, re.IGNORECASE)
+                niv_match = patterns.NIVELURI_STRICT.search(block)
                 if niv_match:
                     nr_niv = niv_match.group(1)
                 
                 # Extract year - multiple patterns
                 year = ""
                 # Pattern 1: "an XXXX" at end (e.g., "P+1+M, an 2008")
-                year_match = re.search(r',?\s*an\s+(19\d{2}|20\d{2})', block, re.IGNORECASE)
+                year_match = patterns.YEAR_AN.search(block)
                 if year_match:
                     year = year_match.group(1)
                 # Pattern 2: "Anul construirii XXXX"
                 if not year:
-                    year_match2 = re.search(r'Anul\s+construirii\s+(19\d{2}|20\d{2})', block, re.IGNORECASE)
+                    year_match2 = patterns.YEAR_ANUL.search(block)
                     if year_match2:
                         year = year_match2.group(1)
                 # Pattern 3: Standalone year (less reliable, use as fallback)
                 if not year:
-                    year_match3 = re.search(r'\b(19[5-9]\d|20[0-2]\d)\b', block)
+                    year_match3 = patterns.YEAR_STANDALONE.search(block)
                     if year_match3:
                         year = year_match3.group(1)
                 
                 # Material extraction
-                material = ""
                 block_lower = block.lower()
-                if "beton" in block_lower: material = "Beton"
-                elif "caramida" in block_lower or "cărămidă" in block_lower: material = "Caramida"
-                elif "lemn" in block_lower: material = "Lemn"
-                elif "paianta" in block_lower or "paiantă" in block_lower: material = "Paianta"
-                elif "metal" in block_lower: material = "Metal"
+                material = MATERIAL_CLASSIFIER.classify(block_lower)
                 
                 # Floor info (obs)
                 obs = ""
-                floor_match = re.search(r'\b((?:S\+)?P(?:\+\d+)?(?:\+M)?)\b', block, re.IGNORECASE)
+                floor_match = patterns.FLOORS.search(block)
                 if floor_match:
                     obs = floor_match.group(1).upper()
                 
-                # Destination - from the entire block (more specific patterns first)
-                dest = "Cladire"
-                if "spatii comerciale" in block_lower or "spatiu comercial" in block_lower: dest = "Spatii Comerciale"
-                elif "pensiune" in block_lower: dest = "Pensiune"
-                elif "cheu" in block_lower or "bazin" in block_lower: dest = "Cheu"
-                elif "vestiar" in block_lower: dest = "Vestiar"
-                elif "sediu" in block_lower: dest = "Sediu"
-                elif "casa de locuit" in block_lower or "casa" in block_lower: dest = "Locuinta"
-                elif "locuinta" in block_lower or "locuințe" in block_lower or "locuinte" in block_lower: dest = "Locuinta"
-                elif "constructii de locuinte" in block_lower: dest = "Locuinta"
-                elif "constructii anexa" in block_lower: dest = "Anexa"
-                elif "anexa" in block_lower or "anexe" in block_lower: dest = "Anexa"
-                elif "garaj" in block_lower: dest = "Garaj"
-                elif "grajd" in block_lower: dest = "Grajd"
-                elif "magazie" in block_lower: dest = "Magazie"
-                elif "remiza" in block_lower or "remiza p.s.i" in block_lower: dest = "Remiza"
-                elif "post trafo" in block_lower: dest = "Post Trafo"
-                elif "birou" in block_lower or "birouri" in block_lower: dest = "Birouri"
-                elif "cabina" in block_lower: dest = "Cabina"
-                elif "punct termic" in block_lower: dest = "Punct Termic"
-                elif "constructii industriale" in block_lower or "industrial" in block_lower: dest = "Industrial"
-                elif "laborator" in block_lower or "cofetarie" in block_lower: dest = "Industrial"
-                elif "atelier" in block_lower: dest = "Atelier"
-                elif "depozit" in block_lower: dest = "Depozit"
-                elif "hala" in block_lower: dest = "Hala"
-                elif "imprejmuire" in block_lower or "gard" in block_lower: dest = "Imprejmuire"
-                elif "sopron" in block_lower: dest = "Sopron"
-                elif "beci" in block_lower or "pivnita" in block_lower: dest = "Beci"
-                elif "wc" in block_lower or "toaleta" in block_lower: dest = "WC"
-                elif "terasa" in block_lower: dest = "Terasa"
-                elif "centrala" in block_lower: dest = "Centrala"
-                elif "statie" in block_lower: dest = "Statie"
-                elif "piscina" in block_lower: dest = "Piscina"
+                # Destination - from the entire block (keyword table in config, more specific first)
+                dest = DESTINATION_CLASSIFIER.classify(block_lower)
                 
                 buildings.append({
                     "nr": cid,
@@ -505,37 +437,27 @@ def extract_constructions(text: str, cad_base: str) -> List[Dict]:
             # Try to fill missing surfaces from B. Partea II notes
             # Pattern: "constructia C1 in suprafata construita de 15 m.p."
             # or "constructia C2 in s.c. de 15 m.p."
-            part_b = re.search(r'B\.\s*Partea\s+II.*?(?=C\.\s*Partea\s+III)', text, re.DOTALL | re.IGNORECASE)
-            if part_b:
-                b_text = part_b.group(0)
+            if sections.part_ii:
+                # One pass over Part II: first surface note per building number
+                noted_surfaces = {}
+                for bp_match in patterns.PART_II_BUILDING_SURFACE.finditer(text, *sections.part_ii):
+                    noted_surfaces.setdefault(bp_match.group(1), bp_match.group(2))
                 for b in buildings:
                     if not b['surface']:
-                        cid_num = b['nr'].replace('C', '')
-                        # Pattern: "constructia C1 in suprafata construita de XX m.p."
-                        bp_match = re.search(
-                            rf'constructi[ai]\s+C{cid_num}\s+(?:in\s+)?(?:suprafata\s+(?:construita\s+)?de|s\.c\.?\s+de)\s+(\d+(?:[.,]\d+)?)\s*m\.?p',
-                            b_text, re.IGNORECASE
-                        )
-                        if bp_match:
-                            b['surface'] = str(int(round(float(bp_match.group(1).replace(',', '.')))))
+                        noted = noted_surfaces.get(b['nr'].replace('C', ''))
+                        if noted:
+                            b['surface'] = str(int(round(float(noted.replace(',', '.')))))
             
             return buildings
     
     # SECOND (fallback): Find the "Date referitoare la constructii" section
-    section_match = re.search(
-        r"Date\s+referitoare\s+la\s+construc[tț]ii(.*?)(?=Lungime\s+Segmente|Extrase\s+pentru|Document\s+care|\Z)", 
-        text, 
-        re.DOTALL | re.IGNORECASE
-    )
-    
-    if not section_match:
+    if not sections.construction_table:
         return []
 
-    block = section_match.group(1)
+    block = sections.section(sections.construction_table)
     
     # Find all construction IDs in the block
-    construction_pattern = r'(\d+-C\d+)'
-    matches = list(re.finditer(construction_pattern, block))
+    matches = list(patterns.CONSTRUCTION_ID.finditer(block))
     
     if not matches:
         return []
@@ -562,14 +484,14 @@ def extract_constructions(text: str, cad_base: str) -> List[Dict]:
         surface = ""
         
         # Pattern 1: "S. construita la sol:XXX mp" or "S. construita:XXX"
-        surf_match = re.search(r"S\.\s*construita[^:]*:?\s*(\d+)", data_chunk, re.IGNORECASE)
+        surf_match = patterns.SURFACE_LABEL.search(data_chunk)
         if surf_match:
             surface = surf_match.group(1)
         
         # Pattern 2: "Supraf. (mp)" column - number on its own line after destination
         if not surface:
             # Look for standalone number (surface) after construction type
-            nums = re.findall(r'\n(\d{2,5})\n', data_chunk)
+            nums = patterns.LINE_NUMBER.findall(data_chunk)
             for n in nums:
                 if 10 <= int(n) <= 50000 and not (1900 < int(n) < 2030):
                     surface = n
@@ -577,13 +499,13 @@ def extract_constructions(text: str, cad_base: str) -> List[Dict]:
         
         # Pattern 3: Number right after text like "constructii industriale"
         if not surface:
-            surf_inline = re.search(r'(?:constructii|anexa|locuinta|garaj)\s*\n?\s*(\d{2,5})', data_chunk, re.IGNORECASE)
+            surf_inline = patterns.SURFACE_AFTER_TYPE.search(data_chunk)
             if surf_inline and not (1900 < int(surf_inline.group(1)) < 2030):
                 surface = surf_inline.group(1)
         
         # Pattern 4: Check the line before the ID
         if not surface and pre_text:
-            nums = re.findall(r'(\d{2,5})', pre_text)
+            nums = patterns.SHORT_NUMBER.findall(pre_text)
             for n in nums:
                 if 10 <= int(n) <= 50000 and not (1900 < int(n) < 2030):
                     surface = n
@@ -591,80 +513,48 @@ def extract_constructions(text: str, cad_base: str) -> List[Dict]:
 
         # Desfasurata surface - multiple patterns
         surf_desf = ""
-        desf_match = re.search(r"desfasurata:?\s*(\d+(?:\.\d+)?)\s*mp", data_chunk, re.IGNORECASE)
+        desf_match = patterns.DESFASURATA.search(data_chunk)
         if desf_match:
             surf_desf = str(int(round(float(desf_match.group(1)))))
         # Also check for "Sup.desfasurata=XXX mp" format
         if not surf_desf:
-            desf_match2 = re.search(r"Sup\.?\s*desfasurata\s*=\s*(\d+)", data_chunk, re.IGNORECASE)
+            desf_match2 = patterns.DESFASURATA_EQ.search(data_chunk)
             if desf_match2:
                 surf_desf = desf_match2.group(1)
 
-        # Destination - more specific patterns first
-        dest = "Cladire"
+        # Destination - keyword table in config, more specific first
         chunk_lower = data_chunk.lower()
-        if "spatii comerciale" in chunk_lower or "spatiu comercial" in chunk_lower: dest = "Spatii Comerciale"
-        elif "pensiune" in chunk_lower: dest = "Pensiune"
-        elif "cheu" in chunk_lower or "bazin" in chunk_lower: dest = "Cheu"
-        elif "vestiar" in chunk_lower: dest = "Vestiar"
-        elif "sediu" in chunk_lower: dest = "Sediu"
-        elif "locuinta" in chunk_lower or "locuințe" in chunk_lower or "locuinte" in chunk_lower: dest = "Locuinta"
-        elif "anexa" in chunk_lower: dest = "Anexa"
-        elif "garaj" in chunk_lower: dest = "Garaj"
-        elif "magazie" in chunk_lower: dest = "Magazie"
-        elif "remiza" in chunk_lower: dest = "Remiza"
-        elif "post trafo" in chunk_lower: dest = "Post Trafo"
-        elif "birou" in chunk_lower: dest = "Birouri"
-        elif "cabina" in chunk_lower: dest = "Cabina"
-        elif "punct termic" in chunk_lower: dest = "Punct Termic"
-        elif "industrial" in chunk_lower: dest = "Industrial"
-        elif "atelier" in chunk_lower: dest = "Atelier"
-        elif "depozit" in chunk_lower: dest = "Depozit"
-        elif "hala" in chunk_lower: dest = "Hala"
-        elif "imprejmuire" in chunk_lower or "gard" in chunk_lower: dest = "Imprejmuire"
-        elif "sopron" in chunk_lower: dest = "Sopron"
-        elif "beci" in chunk_lower or "pivnita" in chunk_lower: dest = "Beci"
-        elif "wc" in chunk_lower or "toaleta" in chunk_lower: dest = "WC"
-        elif "terasa" in chunk_lower: dest = "Terasa"
-        elif "centrala" in chunk_lower: dest = "Centrala"
-        elif "statie" in chunk_lower: dest = "Statie"
-        elif "piscina" in chunk_lower: dest = "Piscina"
-        elif "piata" in chunk_lower: dest = "Piata"
+        dest = DESTINATION_CLASSIFIER.classify(chunk_lower)
 
         # Year - multiple patterns
         year = ""
         # Pattern 1: "an XXXX" at end
-        year_match = re.search(r',?\s*an\s+(19\d{2}|20\d{2})', data_chunk, re.IGNORECASE)
+        year_match = patterns.YEAR_AN.search(data_chunk)
         if year_match:
             year = year_match.group(1)
         # Pattern 2: "Anul construirii XXXX"
         if not year:
-            year_match2 = re.search(r'Anul\s+construirii\s+(19\d{2}|20\d{2})', data_chunk, re.IGNORECASE)
+            year_match2 = patterns.YEAR_ANUL.search(data_chunk)
             if year_match2:
                 year = year_match2.group(1)
         # Pattern 3: Standalone year (less reliable)
         if not year:
-            year_match3 = re.search(r'\b(19[5-9]\d|20[0-2]\d)\b', data_chunk)
+            year_match3 = patterns.YEAR_STANDALONE.search(data_chunk)
             if year_match3:
                 year = year_match3.group(1)
 
         # Material
-        material = ""
-        if "beton" in chunk_lower: material = "Beton"
-        elif "caramida" in chunk_lower or "cărămidă" in chunk_lower: material = "Caramida"
-        elif "lemn" in chunk_lower: material = "Lemn"
-        elif "paianta" in chunk_lower or "paiantă" in chunk_lower: material = "Paianta"
-        elif "metal" in chunk_lower: material = "Metal"
+        material = MATERIAL_CLASSIFIER.classify(chunk_lower)
 
         # Floor info
         obs = ""
-        floor_match = re.search(r"\b((?:S\+)?P(?:\+\d+)?(?:\+M)?)\b", data_chunk, re.IGNORECASE)
+        floor_match = patterns.FLOORS.search(data_chunk)
         if floor_match:
             obs = floor_match.group(1).upper()
         
         # Nr niveluri  
         nr_niv = ""
-        niv_match = re.search(r"Nr\.\s*niveluri:?\s*(\d+)", data_chunk, re.IGNORECASE)
+        niv_match = patterns.NIVELURI.search(data_chunk)
         if niv_match:
             nr_niv = niv_match.group(1)
 
@@ -681,84 +571,65 @@ def extract_constructions(text: str, cad_base: str) -> List[Dict]:
 
     return buildings
 
-def parse_record(filename: str, text: str) -> List[Dict]:
-    """Main Orchestrator."""
+def parse_record(filename: str, text: str) -> List[BuildingRecord]:
+    """Main Orchestrator. One row per building, all sharing the parcel record."""
     clean_txt = clean_text(text)
     
     cf_num = extract_cf_number(clean_txt)
     cad_num = extract_cadastral_number(clean_txt)
     uat, loc = extract_uat_locality(clean_txt)
-    owner, cota, mod, act, owner_history = extract_owner_details(clean_txt)
+    sections = SectionIndex(clean_txt)
+    # Cooperative budget checks for threads where the SIGALRM timer is unavailable
+    check_deadline()
+    owner, cota, mod, act, owner_history = extract_owner_details(clean_txt, sections)
+    check_deadline()
     surf_meas, surf_doc, terrain_obs = extract_parcel_data(clean_txt)
-    sarcini = extract_sarcini(clean_txt)
-    buildings = extract_constructions(clean_txt, cad_num)
+    check_deadline()
+    sarcini = extract_sarcini(clean_txt, sections)
+    buildings = extract_constructions(clean_txt, cad_num, sections)
+    check_deadline()
     
     cerere = ""
-    cerere_match = re.search(r"Cerere\s+nr\.\s*(\d+)", clean_txt, re.IGNORECASE)
+    cerere_match = patterns.CERERE.search(clean_txt)
     if cerere_match: cerere = cerere_match.group(1)
     
     data_em = ""
-    date_match = re.search(r"Ziua\s+(\d{2})\s+Luna\s+(\d{2})\s+Anul\s+(\d{4})", clean_txt)
+    date_match = patterns.ISSUE_DATE.search(clean_txt)
     if date_match: data_em = f"{date_match.group(1)}/{date_match.group(2)}/{date_match.group(3)}"
 
-    records = []
+    parcel = ParcelRecord(
+        Nume_Fisier=filename,
+        Numar_CF=cf_num,
+        UAT=uat,
+        Localitate=loc,
+        Numar_Cadastral=cad_num,
+        Suprafata_Masurata_MP=surf_meas,
+        Suprafata_Din_Act_MP=surf_doc,
+        Observatii_Teren=terrain_obs,
+        Proprietari=owner,
+        Cota_Proprietate=cota,
+        Mod_Dobandire=mod,
+        Act_Proprietate=act,
+        Tulajdonos_Tortenelem=owner_history,
+        Sarcini=sarcini,
+        Data_Emitere_Extras=data_em,
+        Numar_Cerere=cerere
+    )
     
-    if buildings:
-        for b in buildings:
-            records.append({
-                "Nume_Fisier": filename,
-                "Numar_CF": cf_num,
-                "UAT": uat,
-                "Localitate": loc,
-                "Numar_Cadastral": f"{cad_num}-{b['nr']}",
-                "Numar_Topografic": "",
-                "Adresa_Imobil": f"{loc}, {uat}",
-                "Suprafata_Masurata_MP": surf_meas,
-                "Suprafata_Din_Act_MP": surf_doc,
-                "Observatii_Teren": terrain_obs,
-                "Nr_Constructie": b['nr'],
-                "Destinatie_Constructie": b['destinatie'],
-                "Suprafata_Construita_MP": b['surface'],
-                "Suprafata_Desfasurata_MP": b['surface_desf'],
-                "An_Constructie": b['year'],
-                "Nr_Niveluri": b['nr_niv'],
-                "Observatii_Constructie": b['obs'],
-                "Proprietari": owner,
-                "Cota_Proprietate": cota,
-                "Mod_Dobandire": mod,
-                "Act_Proprietate": act,
-                "Tulajdonos_Tortenelem": owner_history,
-                "Sarcini": sarcini,
-                "Data_Emitere_Extras": data_em,
-                "Numar_Cerere": cerere
-            })
-    else:
-        records.append({
-            "Nume_Fisier": filename,
-            "Numar_CF": cf_num,
-            "UAT": uat,
-            "Localitate": loc,
-            "Numar_Cadastral": cad_num,
-            "Numar_Topografic": "",
-            "Adresa_Imobil": f"{loc}, {uat}",
-            "Suprafata_Masurata_MP": surf_meas,
-            "Suprafata_Din_Act_MP": surf_doc,
-            "Observatii_Teren": terrain_obs,
-            "Nr_Constructie": "",
-            "Destinatie_Constructie": "",
-            "Suprafata_Construita_MP": "",
-            "Suprafata_Desfasurata_MP": "",
-            "An_Constructie": "",
-            "Nr_Niveluri": "",
-            "Observatii_Constructie": "",
-            "Proprietari": owner,
-            "Cota_Proprietate": cota,
-            "Mod_Dobandire": mod,
-            "Act_Proprietate": act,
-            "Tulajdonos_Tortenelem": owner_history,
-            "Sarcini": sarcini,
-            "Data_Emitere_Extras": data_em,
-            "Numar_Cerere": cerere
-        })
+    if not buildings:
+        return [BuildingRecord(parcel)]
+    
+    records = []
+    for b in buildings:
+        records.append(BuildingRecord(
+            parcel,
+            Nr_Constructie=b['nr'],
+            Destinatie_Constructie=b['destinatie'],
+            Suprafata_Construita_MP=b['surface'],
+            Suprafata_Desfasurata_MP=b['surface_desf'],
+            An_Constructie=b['year'],
+            Nr_Niveluri=b['nr_niv'],
+            Observatii_Constructie=b['obs']
+        ))
         
     return records
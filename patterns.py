@@ -0,0 +1,213 @@
+"""
+Compiled regular expressions used by parser.py.
+Compiled once at import so the extract_* functions never go through the re module cache.
+Grouped by the extractor that uses them.
+"""
+import logging
+import re
+
+from config import REGEX_ENGINE
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+I = re.IGNORECASE
+S = re.DOTALL
+
+USE_RE2 = re2 is not None and REGEX_ENGINE in ("auto", "re2")
+if REGEX_ENGINE == "re2" and re2 is None:
+    logging.warning("REGEX_ENGINE=re2 but google-re2 is not installed, using re")
+
+# Python's \s / \d on str are Unicode-aware; RE2's are ASCII-only
+_RE2_SPACE = r"\t-\r\x1c-\x20\x85\xa0\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}"
+
+
+def _to_re2(pattern: str, flags: int) -> str:
+    """Rewrite a Python pattern (without lookarounds) so RE2 matches the same text."""
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            esc = pattern[i:i + 2]
+            if esc == r"\s":
+                out.append(_RE2_SPACE if in_class else f"[{_RE2_SPACE}]")
+            elif esc == r"\d":
+                out.append(r"\p{Nd}")
+            elif esc == r"\Z":
+                out.append(r"\z")
+            else:
+                out.append(esc)
+            i += 2
+            continue
+        if ch == "[" and not in_class:
+            in_class = True
+        elif ch == "]" and in_class:
+            in_class = False
+        out.append(ch)
+        i += 1
+    inline = ("i" if flags & re.IGNORECASE else "") + ("s" if flags & re.DOTALL else "")
+    return (f"(?{inline})" if inline else "") + "".join(out)
+
+
+class LinearPattern:
+    """
+    A pattern prone to catastrophic backtracking on OCR garbage.
+    With RE2 available (pip install google-re2) the scan for where a match
+    starts runs in linear time on RE2; re then only matches at that fixed start,
+    so results are exactly re's. RE2 has no lookahead, so a trailing lookahead is
+    passed as `stop` and consumed on the RE2 side. RE2's \\b is ASCII-only and
+    may propose a start that re rejects; the scan then resumes one character on.
+    """
+
+    def __init__(self, body: str, stop: str = None, flags: int = 0):
+        self.pattern = re.compile(body + (f"(?={stop})" if stop else ""), flags)
+        self._linear = None
+        if USE_RE2:
+            self._linear = re2.compile(_to_re2(body + (f"(?:{stop})" if stop else ""), flags))
+
+    def search(self, text: str, pos: int = 0, endpos: int = None):
+        if endpos is None:
+            endpos = len(text)
+        if self._linear is None:
+            return self.pattern.search(text, pos, endpos)
+        while pos <= endpos:
+            candidate = self._linear.search(text, pos, endpos)
+            if candidate is None:
+                return None
+            match = self.pattern.match(text, candidate.start(), endpos)
+            if match:
+                return match
+            pos = candidate.start() + 1
+        return None
+
+    def finditer(self, text: str, pos: int = 0, endpos: int = None):
+        if endpos is None:
+            endpos = len(text)
+        while pos <= endpos:
+            match = self.search(text, pos, endpos)
+            if match is None:
+                return
+            yield match
+            pos = match.end() if match.end() > match.start() else match.end() + 1
+
+    def findall(self, text: str):
+        if self._linear is None:
+            return self.pattern.findall(text)
+        results = []
+        for match in self.finditer(text):
+            if self.pattern.groups == 0:
+                results.append(match.group(0))
+            elif self.pattern.groups == 1:
+                results.append(match.group(1) or "")
+            else:
+                results.append(match.groups(""))
+        return results
+
+
+# Header: CF number, UAT / locality, cadastral number
+CF_NUMBER = re.compile(r"CARTE\s+FUNCIAR[AĂ]\s+NR\.?\s+(\d+)", I)
+UAT = re.compile(r"(?:UAT|Comuna|Oras|Municipiu)[:\s]+([A-Z][a-zA-Z\s\-]+)")
+LOCALITY = re.compile(r"Loc\.\s*([A-Z][a-zA-Z\s\-]+)")
+A1_CADASTRAL = re.compile(r"\bA1[^\d\n]*([0-9\-/]+)")
+CADASTRAL_LABEL = re.compile(r"Nr\.?\s*(?:cadastral|topografic).*?(\d+[0-9\-/]*)", I)
+
+# Section markers, located by sections.SectionIndex
+PART_I_START = re.compile(r"A\.\s*Partea\s+I", I)
+PART_II_START = re.compile(r"B\.\s*Partea\s+II", I)
+PART_III_START = re.compile(r"C\.\s*Partea\s+III", I)
+PART_III_END = re.compile(r"Anexa|Certificat", I)
+CONSTRUCTIONS_START = re.compile(r"Date\s+referitoare\s+la\s+construc[tț]ii", I)
+CONSTRUCTIONS_END = re.compile(r"Lungime\s+Segmente|Extrase\s+pentru|Document\s+care", I)
+
+# Owners (Part II)
+INTABULARE_BLOCK = re.compile(r'B(\d+)\s+(?:Intabulare|intabulare)')
+NEXT_B_BLOCK = re.compile(r'\n(?:B\d+\s)')
+SE_NOTEAZA = re.compile(r'B\d+\s+se\s+noteaza', I)
+RADIATA = re.compile(r'Radiat[a|ă]?\s+prin', I)
+COTA_ACTUALA = re.compile(r'cota\s+actuala\s+(\d+/\d+)', I)
+COTA_ANY = re.compile(r'cota\s+(?:actuala\s+)?(\d+/\d+)', I)
+# Numbered owners "1) NAME": lazy name runs ended by a multi-branch lookahead
+OWNER_NAME = r'(\d+)\)\s*([A-Za-z][A-Za-z\s\.\,\-\"\'\(\)]+?)'
+BLOCK_OWNER = LinearPattern(
+    OWNER_NAME, stop=r'\n\d+\)|\n\d{4,6}\s*/|\n(?:Act|OBSERV|B\d|A\d|Radiat|Document|se\s+noteaz)|\Z')
+NUMBERED_OWNER = LinearPattern(
+    OWNER_NAME, stop=r'\n\d+\)|\n\d{4,6}\s*/|\n(?:Act|OBSERV|B\d|A\d|Radiat|Document)|\Z')
+OWNER_TRAILER = re.compile(
+    r',\s*(?:casatorit|necasatorit|ca\s+bun|bun\s+comun|bun\s+propriu|domeniu\s+privat).*$', I)
+TRAILING_COMMA = re.compile(r',\s*$')
+STATE_OWNERS = [
+    re.compile(r'(STATUL\s+ROMAN)', I),
+    re.compile(r'(AGENTIA\s+DOMENIILOR\s+STATULUI)', I),
+    re.compile(r'(ADMINISTRATIA\s+NATIONALA[^,\n]*)', I),
+    re.compile(r'(REGIA\s+NATIONALA[^,\n]*)', I),
+    re.compile(r'(SOCIETATEA\s+NATIONALA[^,\n]*)', I),
+    re.compile(r'(CONSILIUL\s+LOCAL[^,\n]*)', I),
+    re.compile(r'(PRIMARIA[^,\n]*)', I),
+]
+# Greedy letter run + backtracking to an S.A./S.R.L. suffix: quadratic in re on long letter-only text
+COMPANY_OWNER = LinearPattern(r'(?:S\.C\.\s*)?([A-ZĂÂÎȘȚa-zăâîșț\s\.\-]+(?:S\.A\.|S\.R\.L\.|\bSA\b|\bSRL\b))')
+MUNICIPALITY_OWNER = re.compile(
+    r'((?:MUNICIPIUL|JUDETUL|COMUNA|ORASUL|Municipiul|Judetul|Comuna|Orasul)\s+[A-Za-z]+)')
+MUNICIPALITY_UPPER = re.compile(r'((?:MUNICIPIUL|JUDETUL|COMUNA|ORASUL)\s+[A-Z]+)')
+PERSON_OWNER = re.compile(r'1\)\s*([A-Z][A-Z\-]+\s+[A-Z][A-Za-z\-]+)')
+ACT = re.compile(r"(Act\s+(?:Notarial|Administrativ|Judecatoresc)[^\n]+)", I)
+
+# Owner history
+REGISTRATION_SPLIT = re.compile(r'(\d{4,6}\s*/\s*\d{2}/\d{2}/\d{4})')
+DMY_DATE = re.compile(r'(\d{2})/(\d{2})/(\d{4})')
+HISTORY_OWNER = LinearPattern(
+    OWNER_NAME, stop=r'\n(?:\d+\)|Act|OBSERV|B\d|A\d|Document|se\s+noteaza)|\n\d{4,6}\s*/|\Z')
+HISTORY_TRAILERS = [
+    re.compile(r',\s*domeniu\s+privat.*$', I),
+    re.compile(r',\s*in\s+indiviziune.*$', I),
+    re.compile(r',\s*casatorit.*$', I),
+]
+
+# Encumbrances (Part III)
+BANK = re.compile(r"(?:Banca|BCR|BRD|CEC|Raiffeisen|ING)[^\n]*", I)
+
+# Parcel
+TEREN_NEIMPREJMUIT = re.compile(r"Teren\s+neimprejmuit", I)
+TEREN_IMPREJMUIT = re.compile(r"Teren\s+imprejmuit", I)
+A1_OBS = re.compile(r"A1[^\w\n]+[0-9\-/]+[^\w\n]+[\d\.]+[^\w\n]+(.*?)(?=\s+Adresa|\s+Jud\.|\s+B\.|\s+Partea|\Z)", S)
+MASURATA = re.compile(r"Masurata:?\s*(\d+[\.\s]?\d*)", I)
+DIN_ACTE = re.compile(r"Din\s+acte:?\s*(\d+[\.\s]?\d*)", I)
+A1_TABLE_SURFACE = re.compile(r"A1[^\d\n]+[0-9\-/]+[^\d\n]+(\d{1,3}(?:\.\d{3})*)")
+A1_MULTILINE_SURFACE = re.compile(r"A1\s+(?:CAD:?\s*)?[\d\-/]+[\s\-]*\n[\d/]+\s+(\d{2,6})\s*\n")
+A1_SECTION = re.compile(r"A1\s.*?(?=B\.\s*Partea)", S)
+SPACED_NUMBER = re.compile(r'\s(\d{2,6})\s')
+
+# Constructions, A1.x blocks in Part I
+A1X_START = re.compile(r'\*?A1\.(\d+)\s+(?:CAD:\s*)?(\d+-C\d+)')
+SURFACE_AT_GROUND = re.compile(r'S\.\s*construita\s+la\s+sol:\s*(\d+(?:[.,]\d+)?)\s*mp', I)
+SURFACE_INLINE = re.compile(r'(?:suprafata|suprafață)\s+(?:construita\s+)?de\s+(\d+(?:[.,]\d+)?)\s*m\.?p', I)
+SURFACE_SC = re.compile(r's\.c\.?\s+de\s+(\d+(?:[.,]\d+)?)\s*m\.?p', I)
+NIVELURI_STRICT = re.compile(r'Nr\.\s*niveluri:\s*(\d+)', I)
+# "constructia C1 in suprafata construita de 15 m.p." in Part II, group 1 = building number
+PART_II_BUILDING_SURFACE = re.compile(
+    r'constructi[ai]\s+C(\d+)\s+(?:in\s+)?(?:suprafata\s+(?:construita\s+)?de|s\.c\.?\s+de)\s+(\d+(?:[.,]\d+)?)\s*m\.?p',
+    I)
+
+# Constructions, "Date referitoare la constructii" table
+CONSTRUCTION_ID = re.compile(r'(\d+-C\d+)')
+SURFACE_LABEL = re.compile(r"S\.\s*construita[^:]*:?\s*(\d+)", I)
+LINE_NUMBER = re.compile(r'\n(\d{2,5})\n')
+SURFACE_AFTER_TYPE = re.compile(r'(?:constructii|anexa|locuinta|garaj)\s*\n?\s*(\d{2,5})', I)
+SHORT_NUMBER = re.compile(r'(\d{2,5})')
+NIVELURI = re.compile(r"Nr\.\s*niveluri:?\s*(\d+)", I)
+
+# Constructions, shared by both formats
+DESFASURATA = re.compile(r'desfasurata:?\s*(\d+(?:\.\d+)?)\s*mp', I)
+DESFASURATA_EQ = re.compile(r'Sup\.?\s*desfasurata\s*=\s*(\d+)', I)
+YEAR_AN = re.compile(r',?\s*an\s+(19\d{2}|20\d{2})', I)
+YEAR_ANUL = re.compile(r'Anul\s+construirii\s+(19\d{2}|20\d{2})', I)
+YEAR_STANDALONE = re.compile(r'\b(19[5-9]\d|20[0-2]\d)\b')
+FLOORS = re.compile(r'\b((?:S\+)?P(?:\+\d+)?(?:\+M)?)\b', I)
+
+# Request metadata
+CERERE = re.compile(r"Cerere\s+nr\.\s*(\d+)", I)
+ISSUE_DATE = re.compile(r"Ziua\s+(\d{2})\s+Luna\s+(\d{2})\s+Anul\s+(\d{4})")
@@ -0,0 +1,85 @@
+"""
+Streaming stage pipeline of a processing job:
+
+    discover -> [paths] -> lanes (triage + extract + parse/validate) -> [results] -> sink
+
+Each stage runs on its own: discovery and lane dispatch in threads, the lanes'
+work in their worker processes (FAST_LANE_WORKERS / OCR_LANE_WORKERS), the
+sink (results store, stats, progress) in the job thread. Stages are connected
+by bounded queues: a stage that gets ahead blocks on a full queue instead of
+buffering (backpressure), so memory stays flat whatever the job size and the
+first results reach the store while discovery is still running.
+
+Triage, extraction and parse/validate are deliberately one stage, a single
+process_pdf call per document in a lane worker, rather than three stages with
+queues of their own. Splitting them would pickle every extracted text (tens of
+KB) across processes once more to save about a millisecond of parsing, and
+triage is only a header and font check on the file the extraction reads next.
+The lanes give that stage its concurrency: FAST_LANE_WORKERS for text-layer
+documents, OCR_LANE_WORKERS for the ones needing OCR.
+"""
+import queue
+import threading
+from typing import Callable, Iterable, Iterator
+
+QUEUE_SIZE = 64  # items between two stages
+_POLL = 0.2  # seconds between stop checks of a blocked stage
+
+
+class _End:
+    """End of a stream, optionally carrying the producer's exception."""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+
+
+class Pipe:
+    """Bounded queue between two stages; blocked stages give up once should_stop() is true."""
+
+    def __init__(self, should_stop: Callable[[], bool], maxsize: int = QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize)
+        self._should_stop = should_stop
+
+    def put(self, item) -> bool:
+        """Wait for room and enqueue; False if the job was stopped meanwhile."""
+        while not self._should_stop():
+            try:
+                self._queue.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def close(self, error: Exception = None):
+        self.put(_End(error))
+
+    def __iter__(self) -> Iterator:
+        """Items until the producer closes the pipe (re-raising its exception) or the job stops."""
+        while not self._should_stop():
+            try:
+                item = self._queue.get(timeout=_POLL)
+            except queue.Empty:
+                continue
+            if isinstance(item, _End):
+                if item.error is not None:
+                    raise item.error
+                return
+            yield item
+
+
+def start_stage(name: str, items: Iterable, output: Pipe) -> threading.Thread:
+    """Run a producing stage in a thread: every item of `items` goes into `output`, then the end mark."""
+
+    def run():
+        try:
+            for item in items:
+                if not output.put(item):
+                    return
+        except Exception as e:
+            output.close(e)
+            return
+        output.close()
+
+    thread = threading.Thread(target=run, name=f"pipeline-{name}", daemon=True)
+    thread.start()
+    return thread
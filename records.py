@@ -0,0 +1,99 @@
+"""
+Compact record model for parsed extracts.
+A document's parcel-level data (header, land, owners, encumbrances) is stored
+once in a ParcelRecord; each output row is a slotted BuildingRecord that
+references it and holds only its own construction fields and validation result.
+Rows are flattened to COLUMNS dicts only when exported (Excel, DataFrame).
+"""
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, List, Union
+
+from config import COLUMNS
+
+
+@dataclass(slots=True)
+class ParcelRecord:
+    Nume_Fisier: str
+    Numar_CF: str
+    UAT: str
+    Localitate: str
+    Numar_Cadastral: str
+    Suprafata_Masurata_MP: str
+    Suprafata_Din_Act_MP: str
+    Observatii_Teren: str
+    Proprietari: str
+    Cota_Proprietate: str
+    Mod_Dobandire: str
+    Act_Proprietate: str
+    Tulajdonos_Tortenelem: str
+    Sarcini: str
+    Data_Emitere_Extras: str
+    Numar_Cerere: str
+
+
+@dataclass(slots=True)
+class BuildingRecord:
+    """
+    One output row: a building of the parcel, or the parcel alone (empty
+    construction fields) when the extract lists no buildings. Supports the
+    dict-style get / [] access validate_row and older callers use.
+    """
+    parcel: ParcelRecord
+    Nr_Constructie: str = ""
+    Destinatie_Constructie: str = ""
+    Suprafata_Construita_MP: str = ""
+    Suprafata_Desfasurata_MP: str = ""
+    An_Constructie: str = ""
+    Nr_Niveluri: str = ""
+    Observatii_Constructie: str = ""
+    Status_Validare: str = ""
+    Mesaj_Eroare: str = ""
+
+    # Derived columns, computed on access instead of stored per row
+    @property
+    def Numar_Cadastral(self) -> str:
+        if self.Nr_Constructie:
+            return f"{self.parcel.Numar_Cadastral}-{self.Nr_Constructie}"
+        return self.parcel.Numar_Cadastral
+
+    @property
+    def Numar_Topografic(self) -> str:
+        return ""
+
+    @property
+    def Adresa_Imobil(self) -> str:
+        return f"{self.parcel.Localitate}, {self.parcel.UAT}"
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _ROW_FIELDS or key in _DERIVED_FIELDS:
+            return getattr(self, key)
+        if key in _PARCEL_FIELDS:
+            return getattr(self.parcel, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in _ROW_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_row(self) -> Dict[str, Any]:
+        """Flat dict with every COLUMNS key."""
+        return {column: self[column] for column in COLUMNS}
+
+
+_PARCEL_FIELDS = frozenset(f.name for f in fields(ParcelRecord))
+_ROW_FIELDS = frozenset(f.name for f in fields(BuildingRecord) if f.name != "parcel")
+_DERIVED_FIELDS = frozenset({"Numar_Cadastral", "Numar_Topografic", "Adresa_Imobil"})
+
+Row = Union[BuildingRecord, Dict[str, Any]]
+
+
+def to_rows(records: Iterable[Row]) -> List[Dict[str, Any]]:
+    """Flatten records for export; plain dicts (e.g. rows reloaded from Excel) pass through."""
+    return [record.to_row() if isinstance(record, BuildingRecord) else record for record in records]
@@ -0,0 +1,212 @@
+"""
+SQLite results store of a batch job (results.db in the output directory).
+Source of truth for resume, the error report, downloads and the web UI; the
+Excel is an export of it.
+
+- documents: one row per finished PDF (its error, if any), in processing order
+- settings: job settings fixed when the job starts (e.g. the text backend),
+  reused when it is resumed
+- records: one row per output row (COLUMNS + owner history), indexed on
+  Numar_CF, Numar_Cadastral, UAT, Localitate, Proprietari and the export order
+
+The job thread writes through one connection, inserting each finished PDF as
+it arrives and committing every RESULTS_COMMIT_EVERY PDFs. WAL mode keeps
+readers from ever being blocked; synchronous=FULL fsyncs every commit, so a
+crash (or power loss) loses at most the uncommitted PDFs, which resume redoes.
+Readers (Flask requests, exports) open a short-lived connection per call and
+see the last commit.
+"""
+import logging
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from config import COLUMNS, RESULTS_COMMIT_EVERY
+from records import BuildingRecord
+
+# Stored record fields: the Excel columns plus the owner history the Excel leaves out
+RECORD_FIELDS = COLUMNS + ["Tulajdonos_Tortenelem"]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS documents (
+    file TEXT PRIMARY KEY,
+    error_type TEXT,
+    error_details TEXT
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    {", ".join(f"{field} TEXT" for field in RECORD_FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS idx_records_file ON records(file);
+CREATE INDEX IF NOT EXISTS idx_records_cf ON records(Numar_CF);
+CREATE INDEX IF NOT EXISTS idx_records_cadastral ON records(Numar_Cadastral);
+CREATE INDEX IF NOT EXISTS idx_records_uat ON records(UAT);
+CREATE INDEX IF NOT EXISTS idx_records_localitate ON records(Localitate);
+DROP INDEX IF EXISTS idx_records_status;
+CREATE INDEX IF NOT EXISTS idx_records_export ON records(Status_Validare DESC, Numar_CF, Nume_Fisier);
+CREATE INDEX IF NOT EXISTS idx_records_owner ON records(Proprietari);
+"""
+
+# Equality filters of query_records: parameter -> column
+RECORD_FILTERS = {"uat": "UAT", "localitate": "Localitate", "status": "Status_Validare"}
+
+INSERT_RECORD = (f"INSERT INTO records (file, {', '.join(RECORD_FIELDS)}) "
+                 f"VALUES (?, {', '.join('?' * len(RECORD_FIELDS))})")
+UPSERT_DOCUMENT = ("INSERT INTO documents (file, error_type, error_details) VALUES (?, ?, ?) "
+                   "ON CONFLICT(file) DO UPDATE SET error_type = excluded.error_type, "
+                   "error_details = excluded.error_details")
+
+
+class ResultStore:
+    def __init__(self, path: Path, commit_every: int = RESULTS_COMMIT_EVERY):
+        self.path = Path(path)
+        self.commit_every = max(1, commit_every)
+        self._writer: Optional[sqlite3.Connection] = None
+        self._pending = 0
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        # NORMAL would skip the fsync on commit in WAL mode: a crash could then lose
+        # committed PDFs that resume skips. Commits are batched, so FULL costs little
+        conn.execute("PRAGMA synchronous=FULL")
+        if not self._initialized:
+            self._initialize(conn)
+        return conn
+
+    def _initialize(self, conn: sqlite3.Connection):
+        """Create the schema (once per store; idempotent on an existing database)."""
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        self._initialized = True
+
+    def _write_conn(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self._writer = self._connect()
+        return self._writer
+
+    def _read(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with closing(self._connect()) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    # Writing (job thread)
+
+    def add(self, filename: str, records: List[BuildingRecord], error: Optional[Dict],
+            autocommit: bool = True):
+        """Store a finished PDF, replacing an earlier result of the same file."""
+        conn = self._write_conn()
+        conn.execute(UPSERT_DOCUMENT, (filename, error["type"] if error else None,
+                                       error["details"] if error else None))
+        conn.execute("DELETE FROM records WHERE file = ?", (filename,))
+        conn.executemany(INSERT_RECORD, (
+            (filename, *(record[field] for field in RECORD_FIELDS)) for record in records))
+        self._pending += 1
+        if autocommit and self._pending >= self.commit_every:
+            self.commit()
+
+    def set_setting(self, key: str, value: str):
+        """Record a job setting (committed at once)."""
+        conn = self._write_conn()
+        conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
+        self.commit()
+
+    def commit(self):
+        if self._writer is not None:
+            self._writer.commit()
+            self._pending = 0
+
+    def rollback(self):
+        if self._writer is not None:
+            self._writer.rollback()
+            self._pending = 0
+
+    def checkpoint(self):
+        """Fold the WAL back into the database file and truncate it (run on resume and at job end)."""
+        self.commit()
+        try:
+            self._write_conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.OperationalError as e:
+            logging.warning(f"WAL checkpoint of {self.path.name} skipped: {e}")
+
+    def close(self):
+        if self._writer is not None:
+            self.commit()
+            self._writer.close()
+            self._writer = None
+
+    def reset(self):
+        """Delete the store (database and WAL files)."""
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            path = self.path.with_name(self.path.name + suffix)
+            if path.exists():
+                path.unlink()
+        self._initialized = False
+
+    # Reading (any thread)
+
+    def setting(self, key: str) -> Optional[str]:
+        rows = self._read("SELECT value FROM settings WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def processed_files(self) -> Set[str]:
+        return {file for (file,) in self._read("SELECT file FROM documents")}
+
+    def errors(self) -> List[Dict]:
+        rows = self._read("SELECT file, error_type, error_details FROM documents "
+                          "WHERE error_type IS NOT NULL ORDER BY file")
+        return [{"file": file, "type": error_type, "details": details}
+                for file, error_type, details in rows]
+
+    def has_records(self) -> bool:
+        return bool(self.path.exists() and self._read("SELECT 1 FROM records LIMIT 1"))
+
+    def iter_rows(self, fields: Iterable[str] = COLUMNS) -> Iterator[Tuple]:
+        """
+        Rows for export, sorted by Status_Validare (descending), Numar_CF, then
+        Nume_Fisier and the file's own row order: the same for every run, whatever
+        order the workers finished in. Streamed from the export index.
+        """
+        fields = list(fields)
+        unknown = set(fields) - set(RECORD_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown record fields: {sorted(unknown)}")
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(f"SELECT {', '.join(fields)} FROM records "
+                                  f"ORDER BY Status_Validare DESC, Numar_CF, Nume_Fisier, id")
+            yield from cursor
+
+    def query_records(self, filters: Dict[str, str], owner: str = "", after: int = 0,
+                      limit: int = 100) -> Tuple[List[Dict], Optional[int]]:
+        """
+        One page of records (keyset pagination on id): equality `filters` (keys
+        of RECORD_FILTERS) and an owner substring. Returns (records, cursor of
+        the next page or None).
+        """
+        where = ["id > ?"]
+        params: List = [after]
+        for name, value in filters.items():
+            where.append(f"{RECORD_FILTERS[name]} = ?")
+            params.append(value)
+        if owner:
+            # Substring match (case-insensitive for ASCII, as the parser folds diacritics):
+            # scanned in id order, stopping as soon as the page is full
+            where.append("Proprietari LIKE ? ESCAPE '\\'")
+            params.append("%" + owner.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        rows = self._read(f"SELECT id, {', '.join(RECORD_FIELDS)} FROM records WHERE {' AND '.join(where)} "
+                          f"ORDER BY id LIMIT ?", (*params, limit + 1))
+        records = [dict(zip(RECORD_FIELDS, row[1:])) for row in rows[:limit]]
+        cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return records, cursor
+
+    def records_by_cf(self, cf_number: str) -> List[Dict]:
+        """All records of one CF number (idx_records_cf)."""
+        rows = self._read(f"SELECT {', '.join(RECORD_FIELDS)} FROM records WHERE Numar_CF = ? ORDER BY id",
+                          (cf_number,))
+        return [dict(zip(RECORD_FIELDS, row)) for row in rows]
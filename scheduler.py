@@ -0,0 +1,126 @@
+"""
+Two-lane scheduling of a processing job.
+
+Text-layer PDFs take well under a second, OCR documents tens of seconds, so a
+single queue lets a few scans hold up thousands of quick files. Every PDF first
+goes through the fast lane (triage + text layer, OCR not allowed); a document
+that turns out to need OCR comes back deferred and is queued for the OCR lane,
+a separately sized pool. The OCR queue is ordered longest job first (page count,
+then file size), so the big scans start early and do not end up alone at the
+tail of the job. Once the fast lane has run dry its workers take OCR jobs too.
+
+Results are yielded as they complete, not in input order, so callers can store
+fast-lane results while OCR is still running. A task that raises (a timeout or
+lost worker of the pool) is turned into a result by the caller's on_error.
+"""
+import heapq
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from config import OCR_MAX_PAGES
+
+FAST_LANE = "fast"
+OCR_LANE = "ocr"
+
+# Fast-lane PDFs submitted ahead per worker (keeps workers busy without queueing the whole job)
+FAST_LANE_PREFETCH = 2
+
+Result = Tuple[list, Optional[Dict], Dict]
+
+
+def ocr_cost(pdf_path: Path, stats: Dict) -> Tuple[int, int]:
+    """Estimated OCR cost of a deferred PDF: (pages to rasterize, file size)."""
+    pages = min(stats.get("page_count") or OCR_MAX_PAGES, OCR_MAX_PAGES)
+    try:
+        size = pdf_path.stat().st_size
+    except OSError:
+        size = 0
+    return pages, size
+
+
+def is_deferred(result: Result) -> bool:
+    return bool(result[2].get("deferred"))
+
+
+def run_lanes(pdf_paths: Iterable[Path], fast_task: Callable[[Path], Result],
+              ocr_task: Callable[[Path], Result], fast_pool: Optional[Executor] = None,
+              ocr_pool: Optional[Executor] = None, fast_workers: int = 1, ocr_workers: int = 1,
+              should_stop: Callable[[], bool] = lambda: False,
+              on_error: Optional[Callable[[Path, str, Exception], Result]] = None
+              ) -> Iterator[Tuple[Path, str, Result]]:
+    """
+    Run every PDF through the fast lane, deferred ones through the OCR lane.
+    Yields (pdf_path, lane, result) as results complete; deferred fast-lane
+    results are never yielded. Without pools both lanes run in this thread:
+    all fast-lane documents first, then the OCR queue longest first.
+    Stops submitting work as soon as should_stop() is true. Without on_error
+    a task's exception propagates.
+    """
+    if fast_pool is None or ocr_pool is None:
+        yield from _run_sequential(pdf_paths, fast_task, ocr_task, should_stop)
+        return
+
+    pending = iter(pdf_paths)
+    fast_open = True
+    ocr_queue = []  # heap of (-pages, -size, seq, pdf_path)
+    in_flight = {}  # future -> (pdf_path, lane, pool)
+    load = {id(fast_pool): 0, id(ocr_pool): 0}
+    seq = 0
+
+    def submit(pool, task, pdf_path, lane):
+        in_flight[pool.submit(task, pdf_path)] = (pdf_path, lane, pool)
+        load[id(pool)] += 1
+
+    while True:
+        if should_stop():
+            return
+        # OCR lane: one job per worker, so the longest queued job is picked at dispatch time
+        while ocr_queue and load[id(ocr_pool)] < ocr_workers:
+            submit(ocr_pool, ocr_task, heapq.heappop(ocr_queue)[-1], OCR_LANE)
+        while fast_open and load[id(fast_pool)] < fast_workers * FAST_LANE_PREFETCH:
+            pdf_path = next(pending, None)
+            if pdf_path is None:
+                fast_open = False
+            else:
+                submit(fast_pool, fast_task, pdf_path, FAST_LANE)
+        # Fast lane drained: its idle workers help with the OCR queue
+        while not fast_open and ocr_queue and load[id(fast_pool)] < fast_workers:
+            submit(fast_pool, ocr_task, heapq.heappop(ocr_queue)[-1], OCR_LANE)
+        if not in_flight:
+            return
+
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            pdf_path, lane, pool = in_flight.pop(future)
+            load[id(pool)] -= 1
+            try:
+                result = future.result()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                result = on_error(pdf_path, lane, e)
+            if lane == FAST_LANE and is_deferred(result):
+                pages, size = ocr_cost(pdf_path, result[2])
+                heapq.heappush(ocr_queue, (-pages, -size, seq, pdf_path))
+                seq += 1
+            else:
+                yield pdf_path, lane, result
+
+
+def _run_sequential(pdf_paths, fast_task, ocr_task, should_stop):
+    deferred = []
+    for pdf_path in pdf_paths:
+        if should_stop():
+            return
+        result = fast_task(pdf_path)
+        if is_deferred(result):
+            deferred.append((ocr_cost(pdf_path, result[2]), pdf_path))
+        else:
+            yield pdf_path, FAST_LANE, result
+    # Stable sort: equal costs keep input order
+    deferred.sort(key=lambda item: item[0], reverse=True)
+    for _, pdf_path in deferred:
+        if should_stop():
+            return
+        yield pdf_path, OCR_LANE, ocr_task(pdf_path)
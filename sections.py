@@ -0,0 +1,95 @@
+"""
+Section index of a cleaned extract, built once per document.
+Every section marker is searched for once; Part I, Part II (with its B<n>
+Intabulare blocks), Part III and the construction table are then plain
+(start, end) offsets into the text, so the extractors no longer rescan the
+whole document with their own lazy DOTALL regex.
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import patterns
+
+Span = Tuple[int, int]
+
+
+class OwnerBlock(NamedTuple):
+    number: str  # "3" for B3
+    start: int
+    end: int
+
+
+class SectionIndex:
+    """
+    Offsets of the sections of one extract. Spans are absolute positions in
+    `text`; use them with pattern.search(text, start, end) or slice them once
+    with section().
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._slices: Dict[Span, str] = {}
+
+        part_i_start = patterns.PART_I_START.search(text)
+        part_ii_start = patterns.PART_II_START.search(text)
+        part_iii_start = patterns.PART_III_START.search(text)
+
+        def next_marker(pattern, first, pos):
+            """First match of a marker at or after pos, given its first match in the whole text."""
+            if first is None or first.start() >= pos:
+                return first
+            return pattern.search(text, pos)
+
+        # A. Partea I ... up to the first B. Partea II after it
+        self.part_i: Optional[Span] = None
+        if part_i_start:
+            end = next_marker(patterns.PART_II_START, part_ii_start, part_i_start.end())
+            if end:
+                self.part_i = (part_i_start.start(), end.start())
+
+        # B. Partea II ... up to the first C. Partea III after it
+        self.part_ii: Optional[Span] = None
+        if part_ii_start:
+            end = next_marker(patterns.PART_III_START, part_iii_start, part_ii_start.end())
+            if end:
+                self.part_ii = (part_ii_start.start(), end.start())
+
+        # C. Partea III ... up to Anexa / Certificat or the end of the text
+        self.part_iii: Optional[Span] = None
+        if part_iii_start:
+            end = patterns.PART_III_END.search(text, part_iii_start.end())
+            self.part_iii = (part_iii_start.start(), end.start() if end else len(text))
+
+        # Body of "Date referitoare la constructii" (without the heading)
+        self.construction_table: Optional[Span] = None
+        start = patterns.CONSTRUCTIONS_START.search(text)
+        if start:
+            end = patterns.CONSTRUCTIONS_END.search(text, start.end())
+            self.construction_table = (start.end(), end.start() if end else len(text))
+
+        self.owner_blocks: List[OwnerBlock] = self._find_owner_blocks()
+
+    def _find_owner_blocks(self) -> List[OwnerBlock]:
+        """B<n> Intabulare blocks of Part II, each running to the next one."""
+        if not self.part_ii:
+            return []
+        part_start, part_end = self.part_ii
+        starts = list(patterns.INTABULARE_BLOCK.finditer(self.text, part_start, part_end))
+
+        blocks = []
+        for idx, match in enumerate(starts):
+            if idx + 1 < len(starts):
+                end = starts[idx + 1].start()
+            else:
+                # Last block runs to the next B<n> line or the end of Part II
+                next_section = patterns.NEXT_B_BLOCK.search(self.text, match.end(), part_end)
+                end = next_section.start() if next_section else part_end
+            blocks.append(OwnerBlock(match.group(1), match.start(), end))
+        return blocks
+
+    def section(self, span: Optional[Span]) -> str:
+        """Text of a span ("" if missing); each span is sliced only once."""
+        if span is None:
+            return ""
+        if span not in self._slices:
+            self._slices[span] = self.text[span[0]:span[1]]
+        return self._slices[span]
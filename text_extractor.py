@@ -3,81 +3,483 @@ Optimized text extraction for large batches (1000+ PDFs).
 Improvements: better OCR detection, parallel processing support, memory management.
 """
 import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from pypdf import PdfReader
-from pdf2image import convert_from_path
+from pdf2image import pdfinfo_from_path
 import pytesseract
 from PIL import Image
 import logging
 
+from config import (
+    MIN_TEXT_CHARS, MIN_ALPHA_RATIO, MIN_PAGE_TEXT_CHARS, TEXT_BACKEND, TEXT_MAX_PAGES, PDFTOTEXT_LAYOUT,
+    OCR_DPI, OCR_MAX_PAGES, OCR_ENGINE, OCR_LANG, OCR_PSM, OCR_OEM,
+    CACHE_ENABLED, CACHE_DIR, CACHE_MAX_MB,
+    EARLY_STOP_ENABLED, EARLY_STOP_REQUIRED, EARLY_STOP_MARKERS
+)
+from extraction_cache import ExtractionCache
+from normalize import ocr_normalize
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def extract_text_pypdf(pdf_path: Path) -> str:
-    """Extract text from PDF using pypdf (text layer)."""
-    try:
+# Bump whenever extraction output changes, so cached texts are not reused
+EXTRACTOR_VERSION = "5"
+
+_cache: Optional[ExtractionCache] = None
+
+
+class OcrDeferred(Exception):
+    """Raised by extract_text(allow_ocr=False) when the document needs OCR."""
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Per-process extraction cache (None if disabled)."""
+    global _cache
+    if CACHE_ENABLED and _cache is None:
+        _cache = ExtractionCache(Path(CACHE_DIR), CACHE_MAX_MB * 1024 * 1024)
+    return _cache
+
+
+class SectionTracker:
+    """
+    Watches extracted pages and reports when every section parse_record
+    reads has been seen, so the remaining pages can be skipped.
+    """
+    
+    _required = [re.compile(p, re.IGNORECASE) for p in EARLY_STOP_REQUIRED]
+    _markers = [re.compile(p, re.IGNORECASE) for p in EARLY_STOP_MARKERS]
+    
+    def __init__(self):
+        self.pending = list(self._required)
+        self.complete = False
+    
+    def feed(self, page_text: str) -> bool:
+        """Record one page; True if no further pages are needed."""
+        if not EARLY_STOP_ENABLED or self.complete:
+            return self.complete
+        
+        self.pending = [p for p in self.pending if not p.search(page_text)]
+        if not self.pending and any(m.search(page_text) for m in self._markers):
+            self.complete = True
+        return self.complete
+
+
+def _record_skipped(stats: Optional[Dict], skipped: int):
+    if stats is not None and skipped > 0:
+        stats["pages_skipped"] = stats.get("pages_skipped", 0) + skipped
+
+
+class TextLayerBackend:
+    """Reads the embedded text layer of a PDF page by page."""
+    
+    name = "base"
+    # True if pages are extracted as they are iterated, so stopping early saves work
+    lazy = True
+    
+    @classmethod
+    def available(cls) -> bool:
+        return True
+    
+    def open_pages(self, pdf_path: Path, max_pages: int) -> Tuple[int, Iterator[str]]:
+        """Returns (page_count, iterator of page texts) for the first max_pages pages."""
+        raise NotImplementedError
+
+
+class PypdfBackend(TextLayerBackend):
+    """Pure-Python reference backend."""
+    
+    name = "pypdf"
+    
+    def open_pages(self, pdf_path: Path, max_pages: int) -> Tuple[int, Iterator[str]]:
         reader = PdfReader(str(pdf_path))
-        parts = []
+        page_count = min(max_pages, len(reader.pages))
         
-        # Limit to first 10 pages for performance
-        max_pages = min(10, len(reader.pages))
+        def pages():
+            for i in range(page_count):
+                try:
+                    yield reader.pages[i].extract_text() or ""
+                except Exception as e:
+                    logging.warning(f"Page {i} extraction failed for {pdf_path.name}: {e}")
+                    yield ""
+        
+        return page_count, pages()
+
+
+class PdftotextBackend(TextLayerBackend):
+    """Poppler pdftotext: all pages in one subprocess call, split on form feeds."""
+    
+    name = "pdftotext"
+    lazy = False  # One call extracts every page up to max_pages
+    
+    @classmethod
+    def available(cls) -> bool:
+        return shutil.which("pdftotext") is not None
+    
+    def open_pages(self, pdf_path: Path, max_pages: int) -> Tuple[int, Iterator[str]]:
+        cmd = ["pdftotext", "-enc", "UTF-8", "-f", "1", "-l", str(max_pages)]
+        if PDFTOTEXT_LAYOUT:
+            cmd.append("-layout")
+        cmd += [str(pdf_path), "-"]
+        
+        output = subprocess.run(cmd, capture_output=True, check=True, timeout=120).stdout
+        pages = output.decode("utf-8", errors="replace").split("\f")
+        if pages and not pages[-1].strip():
+            pages.pop()  # pdftotext ends every page with a form feed
+        return len(pages), (page for page in pages)
+
+
+class PdfiumBackend(TextLayerBackend):
+    """PDFium through the optional pypdfium2 package."""
+    
+    name = "pdfium"
+    
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import pypdfium2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+    
+    def open_pages(self, pdf_path: Path, max_pages: int) -> Tuple[int, Iterator[str]]:
+        import pypdfium2 as pdfium
+        document = pdfium.PdfDocument(str(pdf_path))
+        page_count = min(max_pages, len(document))
         
-        for i in range(max_pages):
+        def pages():
             try:
-                page_text = reader.pages[i].extract_text()
-                if page_text:
-                    parts.append(page_text)
-            except Exception as e:
-                logging.warning(f"Page {i} extraction failed for {pdf_path.name}: {e}")
-                continue
+                for i in range(page_count):
+                    try:
+                        yield document[i].get_textpage().get_text_range()
+                    except Exception as e:
+                        logging.warning(f"Page {i} extraction failed for {pdf_path.name}: {e}")
+                        yield ""
+            finally:
+                document.close()
         
-        return "\n".join(parts).strip()
+        return page_count, pages()
+
+
+TEXT_BACKENDS = {
+    PypdfBackend.name: PypdfBackend,
+    PdftotextBackend.name: PdftotextBackend,
+    PdfiumBackend.name: PdfiumBackend,
+}
+
+_text_backends: Dict[str, TextLayerBackend] = {}
+
+
+def get_text_backend(name: Optional[str] = None) -> TextLayerBackend:
+    """Per-process backend instance; None means the configured TEXT_BACKEND ("auto" -> pypdf)."""
+    if name is None:
+        name = TEXT_BACKEND if TEXT_BACKEND != "auto" else PypdfBackend.name
+    if name not in _text_backends:
+        _text_backends[name] = TEXT_BACKENDS[name]()
+    return _text_backends[name]
+
+
+def extract_pages(pdf_path: Path, stats: Optional[Dict] = None, backend: Optional[str] = None) -> List[str]:
+    """Extract the text layer page by page ("" for unreadable pages)."""
+    text_backend = get_text_backend(backend)
+    if stats is not None:
+        stats["text_backend"] = text_backend.name
+    
+    try:
+        page_count, page_texts = text_backend.open_pages(pdf_path, TEXT_MAX_PAGES)
+        pages = []
+        tracker = SectionTracker()
+        
+        for i, page_text in enumerate(page_texts):
+            pages.append(page_text)
+            if page_text and tracker.feed(page_text):
+                page_texts.close()
+                # Only a lazy backend actually skips the remaining pages
+                if text_backend.lazy:
+                    _record_skipped(stats, page_count - i - 1)
+                break
+        
+        return pages
     
     except Exception as e:
-        logging.error(f"pypdf failed for {pdf_path.name}: {e}")
-        return ""
+        logging.error(f"{text_backend.name} failed for {pdf_path.name}: {e}")
+        return []
+
+
+def extract_text_pypdf(pdf_path: Path, stats: Optional[Dict] = None) -> str:
+    """Extract text from PDF using pypdf (text layer)."""
+    return join_pages(extract_pages(pdf_path, stats, backend=PypdfBackend.name))
+
+
+def select_text_backend(sample_pdfs: List[Path]) -> str:
+    """
+    Startup self-benchmark: time every available backend on the sample and return
+    the fastest one whose parse_record output matches pypdf's on every sample PDF.
+    """
+    from parser import parse_record
+    
+    if not sample_pdfs:
+        return PypdfBackend.name
+    
+    timings = {}
+    outputs = {}
+    for name, backend_class in TEXT_BACKENDS.items():
+        if not backend_class.available():
+            continue
+        start = time.perf_counter()
+        texts = [join_pages(extract_pages(pdf, backend=name)) for pdf in sample_pdfs]
+        timings[name] = time.perf_counter() - start
+        outputs[name] = [parse_record(pdf.name, text) for pdf, text in zip(sample_pdfs, texts)]
+    
+    reference = outputs[PypdfBackend.name]
+    eligible = [name for name in timings if outputs[name] == reference]
+    best = min(eligible, key=timings.get)
+    
+    summary = ", ".join(
+        f"{name} {timings[name] * 1000 / len(sample_pdfs):.0f} ms/PDF{'' if name in eligible else ' (output differs)'}"
+        for name in timings
+    )
+    logging.info(f"Text backend self-benchmark: {summary} -> {best}")
+    return best
+
+
+def join_pages(pages: List[str]) -> str:
+    """Stitch page texts together in page order, dropping empty pages."""
+    return "\n".join(page for page in pages if page).strip()
+
+
+class OcrEngine:
+    """Recognizes the text of one page image."""
+    
+    name = "base"
+    
+    def image_to_string(self, image: Image.Image) -> str:
+        raise NotImplementedError
+
+
+class PytesseractEngine(OcrEngine):
+    """Fallback: runs the tesseract CLI once per page through pytesseract."""
+    
+    name = "pytesseract"
+    
+    def __init__(self):
+        self.config = f"--psm {OCR_PSM} --oem {OCR_OEM}"
+    
+    def image_to_string(self, image: Image.Image) -> str:
+        return pytesseract.image_to_string(image, lang=OCR_LANG, config=self.config)
+
+
+class TesserocrEngine(OcrEngine):
+    """
+    Long-lived in-process Tesseract (tesserocr C-API bindings).
+    The language model is loaded once per worker instead of once per page,
+    and pages are handed over in memory: no temp files.
+    """
+    
+    name = "tesserocr"
+    
+    def __init__(self):
+        import tesserocr
+        self._api = tesserocr.PyTessBaseAPI(lang=OCR_LANG, psm=OCR_PSM, oem=OCR_OEM)
+    
+    def image_to_string(self, image: Image.Image) -> str:
+        self._api.SetImage(image)
+        return self._api.GetUTF8Text()
+
+
+OCR_ENGINES = {
+    PytesseractEngine.name: PytesseractEngine,
+    TesserocrEngine.name: TesserocrEngine,
+}
+
+_ocr_engine: Optional[OcrEngine] = None
+
+
+def create_ocr_engine(name: str = OCR_ENGINE) -> OcrEngine:
+    """
+    Build an OCR engine by name. "auto" prefers tesserocr and falls back to
+    pytesseract if it is unavailable.
+    """
+    if name != "auto":
+        return OCR_ENGINES[name]()
+    
+    try:
+        return TesserocrEngine()
+    except (ImportError, RuntimeError) as e:
+        fallback = PytesseractEngine()
+        logging.warning(f"tesserocr unavailable ({e}), using {fallback.name}")
+        return fallback
+
+
+def get_ocr_engine() -> OcrEngine:
+    """Per-process OCR engine, created on first use and kept for the worker's lifetime."""
+    global _ocr_engine
+    if _ocr_engine is None:
+        _ocr_engine = create_ocr_engine()
+    return _ocr_engine
+
+
+def _image_nbytes(image: Image.Image) -> int:
+    """Approximate decoded size of a rasterized page."""
+    return image.width * image.height * len(image.getbands())
+
+
+_PGM_HEADER = re.compile(rb"P5\s+(\d+)\s+(\d+)\s+(\d+)\s")
+
+
+def _image_from_pgm(data: bytes) -> Image.Image:
+    """
+    Wrap pdftoppm's binary PGM output as a grayscale image without copying the pixels.
+    """
+    header = _PGM_HEADER.match(data)
+    if not header:
+        raise ValueError("pdftoppm did not return a PGM image")
+    width, height = int(header.group(1)), int(header.group(2))
+    pixels = memoryview(data)[header.end():header.end() + width * height]
+    return Image.frombuffer("L", (width, height), pixels, "raw", "L", 0, 1)
+
+
+def _render_page(pdf_path: Path, page_number: int, dpi: int) -> Image.Image:
+    """
+    Rasterize a single page (1-based) as grayscale, read as PGM from pdftoppm's
+    stdout (no temp files). This is the command pdf2image's convert_from_path runs,
+    without the pdfinfo call it makes before every page.
+    """
+    result = subprocess.run(
+        ["pdftoppm", "-gray", "-r", str(dpi), "-f", str(page_number), "-l", str(page_number), str(pdf_path)],
+        capture_output=True,
+        check=True
+    )
+    return _image_from_pgm(result.stdout)
+
+
+def iter_page_images(pdf_path: Path, max_pages: int = OCR_MAX_PAGES, dpi: int = OCR_DPI,
+                     stats: Optional[Dict] = None,
+                     page_indices: Optional[List[int]] = None) -> Iterator[Tuple[int, Image.Image]]:
+    """
+    Yield (page_index, image) one page at a time, for all pages or only page_indices.
+    Page N+1 is rendered in the background while the caller OCRs page N,
+    so at most two page images are alive at once. Each image is closed as
+    soon as the caller asks for the next one.
+    """
+    page_count = min(max_pages, pdfinfo_from_path(str(pdf_path))["Pages"])
+    if page_indices is None:
+        page_indices = list(range(page_count))
+    else:
+        page_indices = [i for i in page_indices if i < page_count]
+    if stats is not None:
+        stats["ocr_page_count"] = len(page_indices)
+    if not page_indices:
+        return
+    
+    live_bytes = 0
+    peak_bytes = 0
+    
+    with ThreadPoolExecutor(max_workers=1) as renderer:
+        pending = renderer.submit(_render_page, pdf_path, page_indices[0] + 1, dpi)
+        
+        for n, page_index in enumerate(page_indices, 1):
+            image = pending.result()
+            live_bytes += _image_nbytes(image)
+            
+            # Overlap: start rendering the next page before OCR begins on this one
+            if n < len(page_indices):
+                pending = renderer.submit(_render_page, pdf_path, page_indices[n] + 1, dpi)
+                peak_bytes = max(peak_bytes, live_bytes + _image_nbytes(image))
+            else:
+                peak_bytes = max(peak_bytes, live_bytes)
+            
+            if stats is not None:
+                stats["ocr_pages"] = n
+                stats["ocr_peak_mb"] = round(peak_bytes / (1024 * 1024), 1)
+            
+            try:
+                yield page_index, image
+            finally:
+                live_bytes -= _image_nbytes(image)
+                image.close()
+                del image
 
 
-def extract_text_ocr(pdf_path: Path, temp_dir: Path) -> str:
+def extract_text_ocr(pdf_path: Path, stats: Optional[Dict] = None,
+                     page_texts: Optional[List[Optional[str]]] = None) -> str:
     """
-    Convert PDF to images and OCR with Tesseract.
+    Rasterize the PDF page by page and OCR with Tesseract.
+    page_texts enables hybrid mode: pages with a usable text layer keep it,
+    only pages marked None are OCR'd, and everything is stitched in page order.
+    Pages travel as in-memory pixel buffers; with tesserocr nothing touches the disk
+    (pytesseract, the fallback, writes a temp PNG per page).
     Optimized for Romanian cadastral documents.
     """
     try:
-        temp_dir.mkdir(parents=True, exist_ok=True)
+        parts = []
+        engine = get_ocr_engine()
+        if stats is not None:
+            stats["ocr_engine"] = engine.name
+        tracker = SectionTracker()
         
-        # Convert only first 5 pages (cadastral docs are typically 3 pages)
-        images = convert_from_path(
-            str(pdf_path), 
-            first_page=1, 
-            last_page=5,
-            dpi=300,  # Higher DPI for better OCR accuracy
-            grayscale=True  # Faster processing
-        )
+        ocr_indices = None
+        if page_texts is not None:
+            ocr_indices = [i for i, text in enumerate(page_texts) if text is None]
+            if stats is not None:
+                stats["ocr_page_indices"] = ocr_indices
+        pages = iter_page_images(pdf_path, stats=stats, page_indices=ocr_indices)
         
-        parts = []
+        # Text-layer pages are emitted lazily, in order, ahead of the next OCR page
+        layer_pages = iter(enumerate(page_texts or []))
+        
+        def take_layer_pages(before: int) -> bool:
+            for index, text in layer_pages:
+                if text:
+                    parts.append(text)
+                    if tracker.feed(text):
+                        return True
+                if index + 1 >= before:
+                    break
+            return False
+        
+        complete = False
+        ocr_done = 0
         
-        for i, image in enumerate(images):
+        # Only the first pages matter (cadastral docs are typically 3 pages)
+        for i, image in pages:
+            if take_layer_pages(i):
+                complete = True
+                break
+            
+            ocr_done += 1
             try:
-                # Tesseract with Romanian language
-                text = pytesseract.image_to_string(
-                    image,
-                    lang="ron",  # Romanian language pack
-                    config='--psm 6 --oem 3'  # PSM 6 = uniform text block, OEM 3 = default
-                )
+                # Tesseract with Romanian language, PSM 6 / OEM 3
+                text = engine.image_to_string(image)
                 
+                # Cleanup: Romanian character normalization
+                text = normalize_romanian_text(text)
                 if text.strip():
                     parts.append(text)
             
             except Exception as e:
                 logging.warning(f"OCR failed on {pdf_path.name} page {i}: {e}")
                 continue
+            
+            if text.strip() and tracker.feed(text):
+                complete = True
+                break
+        
+        if complete:
+            pages.close()
+            if stats is not None:
+                _record_skipped(stats, stats["ocr_page_count"] - ocr_done)
+        else:
+            take_layer_pages(len(page_texts or []))
         
         result = "\n".join(parts).strip()
         
-        # Cleanup: Romanian character normalization
-        result = normalize_romanian_text(result)
+        if stats is not None and "ocr_peak_mb" in stats:
+            logging.info(f"OCR {pdf_path.name}: {stats['ocr_pages']} pages, peak raster memory {stats['ocr_peak_mb']} MB")
         
         return result
     
@@ -88,25 +490,15 @@ def extract_text_ocr(pdf_path: Path, temp_dir: Path) -> str:
 
 def normalize_romanian_text(text: str) -> str:
     """Fix common OCR errors in Romanian text."""
-    if not text:
-        return ""
-    
-    # Common OCR misreads - normalize cedilla forms to comma-below forms
-    replacements = {
-        'ţ': 'ț',  # t-cedilla to t-comma-below
-        'ş': 'ș',  # s-cedilla to s-comma-below
-        'Ţ': 'Ț',  # T-cedilla to T-comma-below
-        'Ş': 'Ș',  # S-cedilla to S-comma-below
-        '|': 'I',  # Common OCR mistake: pipe to I
-    }
-    
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    
-    return text
+    return ocr_normalize(text)
+
+
+def _alpha_ratio(text: str) -> float:
+    alpha_count = sum(1 for c in text if c.isalpha())
+    return alpha_count / max(len(text), 1)
 
 
-def needs_ocr(text: str, min_chars: int = 150, min_alpha_ratio: float = 0.05) -> bool:
+def needs_ocr(text: str, min_chars: int = MIN_TEXT_CHARS, min_alpha_ratio: float = MIN_ALPHA_RATIO) -> bool:
     """
     Determine if PDF needs OCR fallback.
     Enhanced logic for cadastral documents.
@@ -122,30 +514,107 @@ def needs_ocr(text: str, min_chars: int = 150, min_alpha_ratio: float = 0.05) ->
         return True
     
     # Check alphabetic ratio
-    alpha_count = sum(1 for c in text if c.isalpha())
-    ratio = alpha_count / max(len(text), 1)
-    
-    return ratio < min_alpha_ratio
+    return _alpha_ratio(text) < min_alpha_ratio
+
+
+def page_has_garbage_layer(page_text: str, min_chars: int = MIN_PAGE_TEXT_CHARS,
+                           min_alpha_ratio: float = MIN_ALPHA_RATIO) -> bool:
+    """Enough characters on the page to judge, but hardly any letters (broken font encoding)."""
+    page_text = page_text.strip() if page_text else ""
+    return len(page_text) >= min_chars and _alpha_ratio(page_text) < min_alpha_ratio
+
+
+def page_needs_ocr(page_text: str, min_chars: int = MIN_PAGE_TEXT_CHARS,
+                   min_alpha_ratio: float = MIN_ALPHA_RATIO) -> bool:
+    """
+    needs_ocr criteria for a single page: missing (blank or a few stray characters) or garbage text layer.
+    The per-page minimum is far below the document's: a page with a short real text layer is not weak.
+    The key-term check stays document-level (not every page carries the header terms).
+    """
+    if not page_text or len(page_text.strip()) < min_chars:
+        return True
+    return _alpha_ratio(page_text) < min_alpha_ratio
 
 
-def extract_text(pdf_path: Path, temp_dir: Path) -> Tuple[str, bool]:
+def extract_text(pdf_path: Path, stats: Optional[Dict] = None,
+                 text_backend: Optional[str] = None, scanned: bool = False,
+                 allow_ocr: bool = True) -> Tuple[str, bool]:
     """
-    Extract text from PDF with intelligent fallback.
+    Extract text from PDF with intelligent fallback, consulting the extraction cache first.
+    text_backend picks the text-layer backend (default: TEXT_BACKEND).
+    scanned=True (from triage) skips the text layer and goes straight to OCR.
+    allow_ocr=False raises OcrDeferred instead of running OCR (cached OCR text is still returned).
+    If a stats dict is given, per-document metrics (cache hit, OCR pages, peak memory) are recorded in it.
     Returns: (text, used_ocr)
     """
     logging.info(f"Processing: {pdf_path.name}")
     
+    cache = get_extraction_cache()
+    if cache is None:
+        return _extract_text_uncached(pdf_path, stats, text_backend, scanned, allow_ocr)
+    
+    # Backends lay text out differently, so each gets its own cache entries
+    key = cache.make_key(pdf_path, f"{EXTRACTOR_VERSION}:{get_text_backend(text_backend).name}")
+    cached = cache.get(key)
+    if stats is not None:
+        stats["cache_hit"] = cached is not None
+    if cached is not None:
+        logging.info(f"✓ {pdf_path.name} - Cache hit")
+        return cached
+    
+    text, used_ocr = _extract_text_uncached(pdf_path, stats, text_backend, scanned, allow_ocr)
+    if text.strip():
+        cache.put(key, text, used_ocr)
+    return text, used_ocr
+
+
+def _extract_text_uncached(pdf_path: Path, stats: Optional[Dict] = None,
+                           text_backend: Optional[str] = None, scanned: bool = False,
+                           allow_ocr: bool = True) -> Tuple[str, bool]:
+    """Text layer with per-page OCR fallback."""
+    if scanned and not allow_ocr:
+        raise OcrDeferred(pdf_path.name)
+    if scanned:
+        logging.info(f"↻ {pdf_path.name} - Using OCR (scanned, no fonts)")
+        text = extract_text_ocr(pdf_path, stats)
+        return text, True
+    
     # Step 1: Try direct text extraction
-    text = extract_text_pypdf(pdf_path)
+    pages = extract_pages(pdf_path, stats, text_backend)
+    text = join_pages(pages)
     
-    # Step 2: Check if OCR is needed
-    if not needs_ocr(text):
+    # Step 2: Check which pages need OCR
+    document_weak = needs_ocr(text)
+    if document_weak:
+        weak_pages = [i for i, page in enumerate(pages) if page_needs_ocr(page)]
+    else:
+        # The document already passes: blank or short pages (signature, blank back page)
+        # keep their text layer, only pages with a garbage layer are OCR'd
+        weak_pages = [i for i, page in enumerate(pages) if page_has_garbage_layer(page)]
+    
+    if not weak_pages and not document_weak:
         logging.info(f"✓ {pdf_path.name} - Text layer OK")
         return text, False
     
-    # Step 3: Fallback to OCR
-    logging.info(f"↻ {pdf_path.name} - Using OCR (weak text layer)")
-    text = extract_text_ocr(pdf_path, temp_dir)
+    if stats is not None:
+        # Text-layer metrics behind the needs_ocr decision, for tuning against OCR confidence
+        stats["text_layer_chars"] = len(text)
+        stats["text_layer_alpha_ratio"] = round(_alpha_ratio(text), 3)
+    if not allow_ocr:
+        raise OcrDeferred(pdf_path.name)
+    
+    # Step 3: Fallback to OCR - only the weak pages, unless the whole layer is unusable
+    if document_weak and len(weak_pages) == len(pages):
+        logging.info(f"↻ {pdf_path.name} - Using OCR (weak text layer)")
+        text = extract_text_ocr(pdf_path, stats)
+    elif document_weak and not weak_pages:
+        # Every page looks like text but the document as a whole does not (garbage layer)
+        logging.info(f"↻ {pdf_path.name} - Using OCR (garbage text layer)")
+        text = extract_text_ocr(pdf_path, stats)
+    else:
+        logging.info(f"↻ {pdf_path.name} - OCR for pages {weak_pages} (hybrid)")
+        page_texts = [None if i in weak_pages else page for i, page in enumerate(pages)]
+        text = extract_text_ocr(pdf_path, stats, page_texts=page_texts)
     
     if text.strip():
         logging.info(f"✓ {pdf_path.name} - OCR successful")
@@ -155,7 +624,7 @@ def extract_text(pdf_path: Path, temp_dir: Path) -> Tuple[str, bool]:
     return text, True
 
 
-def batch_extract_text(pdf_paths: list, temp_dir: Path, max_workers: int = 4):
+def batch_extract_text(pdf_paths: list, max_workers: int = 4):
     """
     Extract text from multiple PDFs in parallel (optional).
     Use for very large batches (500+).
@@ -166,7 +635,7 @@ def batch_extract_text(pdf_paths: list, temp_dir: Path, max_workers: int = 4):
     
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         future_to_pdf = {
-            executor.submit(extract_text, pdf, temp_dir): pdf 
+            executor.submit(extract_text, pdf): pdf 
             for pdf in pdf_paths
         }
         
@@ -0,0 +1,117 @@
+"""
+Pre-flight PDF triage.
+Sorts every file into a processing route before any text extraction, so junk
+(resource forks, broken downloads, password-protected files) never reaches OCR.
+"""
+import logging
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+from pypdf import PdfReader
+
+ROUTE_TEXT_LAYER = "text-layer"
+ROUTE_SCANNED = "scanned"
+ROUTE_ENCRYPTED = "encrypted"
+ROUTE_CORRUPT = "corrupt"
+ROUTE_NOT_PDF = "not-a-pdf"
+
+# Error type and message reported for routes that stop processing
+ROUTE_ERRORS = {
+    ROUTE_ENCRYPTED: ("ENCRYPTED_PDF", "Jelszóval védett PDF"),
+    ROUTE_CORRUPT: ("CORRUPT_PDF", "Sérült PDF"),
+    ROUTE_NOT_PDF: ("NOT_PDF", "Nem PDF fájl"),
+}
+
+HEADER_BYTES = 1024  # The %PDF- marker must appear in the first 1 KB
+TRAILER_BYTES = 2048
+APPLEDOUBLE_MAGIC = b"\x00\x05\x16\x07"  # macOS "._" resource fork
+SNIFF_PAGES = 3  # Pages inspected for fonts / images
+MAX_FORM_DEPTH = 2  # Nesting of form XObjects followed when looking for fonts / images
+
+
+class TriageResult(NamedTuple):
+    route: str
+    page_count: int = 0
+    details: str = ""
+
+
+def _sniff_bytes(pdf_path: Path) -> Optional[str]:
+    """Header/trailer check on raw bytes. Returns a problem description or None."""
+    with open(pdf_path, 'rb') as f:
+        head = f.read(HEADER_BYTES)
+        if head.startswith(APPLEDOUBLE_MAGIC):
+            return "macOS erőforrás-fájl (._)"
+        if b"%PDF-" not in head:
+            return "hiányzó %PDF fejléc"
+
+        f.seek(0, 2)
+        size = f.tell()
+        f.seek(max(0, size - TRAILER_BYTES))
+        if b"%%EOF" not in f.read():
+            logging.warning(f"{pdf_path.name}: no %%EOF trailer (truncated?)")
+    return None
+
+
+def _page_content_kinds(page) -> Tuple[bool, bool]:
+    """(has_fonts, has_images) for a page, looking into nested form XObjects."""
+    has_fonts = False
+    has_images = False
+    pending = [(page.get("/Resources"), 0)]
+
+    while pending:
+        resources, depth = pending.pop()
+        if resources is None:
+            continue
+        resources = resources.get_object()
+        if resources.get("/Font"):
+            has_fonts = True
+        xobjects = resources.get("/XObject")
+        if not xobjects:
+            continue
+        for xobject in xobjects.get_object().values():
+            xobject = xobject.get_object()
+            subtype = xobject.get("/Subtype")
+            if subtype == "/Image":
+                has_images = True
+            elif subtype == "/Form" and depth < MAX_FORM_DEPTH:
+                pending.append((xobject.get("/Resources"), depth + 1))
+
+    return has_fonts, has_images
+
+
+def triage_pdf(pdf_path: Path) -> TriageResult:
+    """
+    Classify a file as text-layer, scanned, encrypted, corrupt or not-a-PDF.
+    Only parses the xref and the resources of the first pages.
+    """
+    problem = _sniff_bytes(pdf_path)
+    if problem:
+        return TriageResult(ROUTE_NOT_PDF, details=problem)
+
+    try:
+        reader = PdfReader(str(pdf_path), strict=False)
+        if reader.is_encrypted:
+            # Permission-only encryption opens with an empty user password
+            try:
+                if not reader.decrypt(""):
+                    return TriageResult(ROUTE_ENCRYPTED, details="jelszó szükséges")
+            except Exception as e:
+                return TriageResult(ROUTE_ENCRYPTED, details=str(e)[:100])
+
+        page_count = len(reader.pages)
+        if page_count == 0:
+            return TriageResult(ROUTE_CORRUPT, details="0 oldal")
+
+        has_fonts = False
+        has_images = False
+        for page in reader.pages[:SNIFF_PAGES]:
+            fonts, images = _page_content_kinds(page)
+            has_fonts = has_fonts or fonts
+            has_images = has_images or images
+
+    except Exception as e:
+        return TriageResult(ROUTE_CORRUPT, details=str(e)[:100])
+
+    if has_images and not has_fonts:
+        return TriageResult(ROUTE_SCANNED, page_count)
+    return TriageResult(ROUTE_TEXT_LAYER, page_count)
@@ -0,0 +1,253 @@
+"""
+Supervised process pool for processing jobs.
+
+ProcessPoolExecutor cannot stop a single task: a PDF that hangs pdftoppm or
+Tesseract holds its worker for good and the job never finishes. Here every
+worker runs in its own process group (its pdftoppm/tesseract children
+included) and a supervisor thread
+- kills the whole group of a worker whose task runs past the timeout, fails
+  that task with TaskTimeout and starts a replacement worker;
+- recycles a worker after max_tasks tasks or once its RSS exceeds max_rss_mb
+  (read from /proc, Linux only), containing leaks in pypdf/PIL;
+- fails the task of a worker that died with WorkerLost.
+It implements the Executor interface the scheduler uses (submit/shutdown).
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from multiprocessing.connection import wait as wait_connections
+from typing import Deque, List, Optional, Tuple
+
+POLL_INTERVAL = 0.5  # seconds between timeout checks
+RETIRE_GRACE = 5.0  # seconds a recycled worker gets to exit before it is killed
+
+
+class TaskTimeout(Exception):
+    """A task ran past the pool's wall-clock limit; its worker was killed."""
+
+
+class WorkerLost(Exception):
+    """The worker process running a task died (or the pool was shut down under it)."""
+
+
+def _worker_main(conn):
+    if hasattr(os, "setsid"):
+        os.setsid()  # own process group, so killpg also reaches pdftoppm/tesseract
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        fn, args = task
+        try:
+            reply = (True, fn(*args))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception as e:  # unpicklable result or exception
+            conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+def _rss_mb(pid: int) -> float:
+    """Resident memory of a process in MB (0 where /proc is unavailable)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return 0.0
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.future: Optional[Future] = None
+        self.started = 0.0
+        self.tasks = 0
+
+    def kill(self):
+        """Kill the worker and everything in its process group."""
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except (ProcessLookupError, PermissionError):
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def retire(self):
+        """Let an idle worker exit, killing it if it does not."""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(RETIRE_GRACE)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class SupervisedPool(Executor):
+    def __init__(self, max_workers: int, task_timeout: float = 0, max_tasks: int = 0, max_rss_mb: float = 0):
+        """
+        task_timeout: wall-clock seconds per task (0 = unlimited)
+        max_tasks: tasks after which a worker is replaced (0 = never)
+        max_rss_mb: RSS after which a worker is replaced (0 = never)
+        """
+        self.max_workers = max(1, max_workers)
+        self.task_timeout = task_timeout
+        self.max_tasks = max_tasks
+        self.max_rss_mb = max_rss_mb
+        self._context = multiprocessing.get_context()
+        self._queue: Deque[Tuple[Future, object, tuple]] = deque()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        # Wakes the supervisor out of its wait when tasks are submitted or the pool shuts down
+        self._wake_recv, self._wake_send = self._context.Pipe(duplex=False)
+        self._shutdown = False
+        self._abort = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, fn, *args):
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot submit to a pool that was shut down")
+            self._queue.append((future, fn, args))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._supervise, name="SupervisedPool", daemon=True)
+                self._thread.start()
+            self._wake()
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        """
+        Stop once the submitted tasks are done. cancel_futures=True drops the
+        queued tasks and kills the running ones (failed with WorkerLost).
+        """
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                self._abort = True
+                self._cancel_queued()
+            self._wake()
+            thread = self._thread
+        if wait and thread is not None:
+            thread.join()
+
+    def _cancel_queued(self):
+        """Cancel the tasks not started yet, waking concurrent.futures.wait() callers."""
+        while self._queue:
+            future = self._queue.popleft()[0]
+            # Future.cancel() alone does not notify wait(); set_running_or_notify_cancel() does
+            future.cancel()
+            future.set_running_or_notify_cancel()
+
+    def _wake(self):
+        try:
+            self._wake_send.send_bytes(b"")
+        except OSError:  # supervisor already gone
+            pass
+
+    # Supervisor thread
+
+    def _supervise(self):
+        try:
+            while True:
+                with self._lock:
+                    if self._abort:
+                        break
+                    self._dispatch()
+                    busy = [worker for worker in self._workers if worker.future is not None]
+                    if not busy and self._shutdown:
+                        break
+                ready = wait_connections([self._wake_recv] + [worker.conn for worker in busy],
+                                         timeout=POLL_INTERVAL)
+                while self._wake_recv.poll():
+                    self._wake_recv.recv_bytes()
+                now = time.monotonic()
+                for worker in busy:
+                    if worker.conn in ready:
+                        self._collect(worker)
+                    elif self.task_timeout and now - worker.started > self.task_timeout:
+                        logging.warning(f"Worker {worker.process.pid} killed after {self.task_timeout:g}s")
+                        self._discard(worker, TaskTimeout(f"{self.task_timeout:g}s"))
+        except Exception:
+            logging.exception("Worker pool supervisor failed")
+        finally:
+            for worker in list(self._workers):
+                if worker.future is not None:
+                    self._discard(worker, WorkerLost("pool shut down"))
+                else:
+                    worker.retire()
+            self._workers = []
+            with self._lock:
+                self._shutdown = True
+                self._cancel_queued()
+            self._wake_recv.close()
+
+    def _dispatch(self):
+        """Hand queued tasks to idle workers, starting workers up to max_workers."""
+        while self._queue:
+            worker = next((w for w in self._workers if w.future is None), None)
+            if worker is None:
+                if len(self._workers) >= self.max_workers:
+                    return
+                worker = _Worker(self._context)
+                self._workers.append(worker)
+            future, fn, args = self._queue.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                worker.conn.send((fn, args))
+            except (BrokenPipeError, EOFError, ConnectionError):
+                self._workers.remove(worker)
+                worker.kill()
+                future.set_exception(WorkerLost("worker exited before the task started"))
+                continue
+            except Exception as e:  # arguments not picklable
+                future.set_exception(e)
+                continue
+            worker.future = future
+            worker.started = time.monotonic()
+
+    def _collect(self, worker: _Worker):
+        try:
+            ok, value = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.process.join(RETIRE_GRACE)
+            self._discard(worker, WorkerLost(f"worker exited with code {worker.process.exitcode}"))
+            return
+        future, worker.future = worker.future, None
+        worker.tasks += 1
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+        if ((self.max_tasks and worker.tasks >= self.max_tasks)
+                or (self.max_rss_mb and _rss_mb(worker.process.pid) > self.max_rss_mb)):
+            self._workers.remove(worker)
+            worker.retire()
+
+    def _discard(self, worker: _Worker, error: Exception):
+        """Kill a busy worker and fail its task; a replacement starts on the next dispatch."""
+        self._workers.remove(worker)
+        worker.kill()
+        future, worker.future = worker.future, None
+        future.set_exception(error)